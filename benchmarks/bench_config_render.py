@@ -0,0 +1,60 @@
+'''
+Micro-benchmark per-node config rendering: old (Jinja Template compile + render per
+node) and new (role template compiled once by Evenger.node_configs, rendered on use)
+
+Run: python benchmarks/bench_config_render.py [--nodes 1000] [--ports 200]
+'''
+import argparse
+import os
+import tempfile
+import time
+
+from jinja2 import StrictUndefined, Template
+
+from evenger import Evenger
+
+ROLE_TEMPLATE = '''configure
+    system name "{{ node_name }}"
+    router interface "system" address {{ system_ip }}/32
+{% for i in range(1, ports|int + 1) %}    port 1/1/{{ i }} description "{{ node_name }} port {{ i }}" no shutdown
+{% endfor %}exit all
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=1000)
+    parser.add_argument('--ports', type=int, default=200)
+    args = parser.parse_args()
+
+    sheet_rows = [('add_node_sros_iom', ['image', 'name', 'config_template', 'system_ip', 'ports'],
+                   ['timosiom-21.10.R6', f'pe_{i}', 'pe', f'10.0.{i // 250}.{i % 250 + 1}', str(args.ports)])
+                  for i in range(args.nodes)]
+    node_variables = Evenger.node_config_variables(sheet_rows)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, 'pe.j2'), 'w') as file:
+            file.write(ROLE_TEMPLATE)
+
+        start = time.perf_counter()
+        old_configs = [
+            Template(ROLE_TEMPLATE, undefined=StrictUndefined, keep_trailing_newline=True).render(i)
+            for i in node_variables.values()
+        ]
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        node_configs = Evenger.node_configs(sheet_rows, tmp_dir)
+        new_configs = [i() for i in node_configs.values()]
+        new_time = time.perf_counter() - start
+
+    assert old_configs == new_configs
+    lines = sum(i.count('\n') for i in new_configs)
+    print(f'nodes / config lines          : {args.nodes} / {lines}')
+    print(f'old (compile/render per node) : {old_time / args.nodes * 1e3:10.3f} ms/node')
+    print(f'new (compiled once)           : {new_time / args.nodes * 1e3:10.3f} ms/node')
+    print(f'speedup                       : {old_time / new_time:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
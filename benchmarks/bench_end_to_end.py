@@ -0,0 +1,193 @@
+'''
+End-to-end benchmark against local eve-ng simulator (eveng_simulator.py): time
+excel_topology (lab build from generated workbook), lab copies of built lab (clone_lab,
+import_lab of one export_lab), link creation (connect_links), config_with_telnet and
+upload_startup_configs (same config lines without console commands) on synthetic labs
+with 10, 100 and 1000 nodes
+
+Each lab has one management bridge, nodes with telnet console connected to bridge
+and ring node to node links. Lab state is checked after build if no error is injected.
+Simulator runs in the same process (shared GIL), times include server side work,
+compare results of runs with same options.
+
+Run: python benchmarks/bench_end_to_end.py [--sizes 10 100 1000] [--workers 8]
+     [--latency 0.002] [--jitter 0] [--error_rate 0] [--expire_after 0] [--json_file results.json]
+'''
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+from evenger import Evenger
+from eveng_simulator import EvengSimulator
+
+
+def create_workbook(filename, url, lab_path, nodes, workers):
+    ''' write evenger workbook with <nodes> sros_iom nodes, management bridge and ring links '''
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet('_LAB_INFO')
+    sheet.append(['LAB INFORMATION'])
+    sheet.append(['', 'eveng_server_url', 'username', 'password', 'lab_path', 'pool_size'])
+    sheet.append(['', url, 'admin', 'eve', lab_path, str(workers)])
+
+    sheet = workbook.create_sheet('add_network')
+    sheet.append(['add_network for bridge'])
+    sheet.append(['position', 'name', 'type', 'left', 'top'])
+    sheet.append(['', 'Management', 'bridge', '0', '0'])
+
+    sheet = workbook.create_sheet('add_node_sros_iom')
+    sheet.append(['add_node_sros_iom for sros iom'])
+    sheet.append(['position', 'image', 'name', 'timos_line', 'left', 'top'])
+    for i in range(nodes):
+        sheet.append(['', 'timosiom-21.10.R6', f'node_{i}', 'slot=1 chassis=SR-12 card=iom4-e',
+                      str(i % 20 * 100), str(i // 20 * 100 + 100)])
+
+    sheet = workbook.create_sheet('connect_node_to_bridge')
+    sheet.append(['connect_node_to_bridge for management'])
+    sheet.append(['position', 'node_name', 'node_port', 'bridge_name'])
+    for i in range(nodes):
+        sheet.append(['', f'node_{i}', '1/1/1', 'Management'])
+
+    sheet = workbook.create_sheet('connect_node_to_node')
+    sheet.append(['connect_node_to_node for ring'])
+    sheet.append(['position', 'first_node', 'first_port', 'second_node', 'second_port'])
+    for i in range(nodes):
+        sheet.append(['', f'node_{i}', '1/1/2', f'node_{(i + 1) % nodes}', '1/1/3'])
+    workbook.save(filename)
+
+
+def write_configs(config_folder, nodes, lines, console=True):
+    ''' write config file per node with <lines> config lines (with telnet login if console) '''
+    os.makedirs(config_folder, exist_ok=True)
+    config_lines = '\n'.join(f'    interface port{i} description bench' for i in range(lines))
+    login = '_EXPECT: ogin\nadmin\n_EXPECT: assword\nadmin\n_EXPECT: #\n' if console else ''
+    for i in range(nodes):
+        with open(os.path.join(config_folder, f'node_{i}.txt'), 'w') as file:
+            file.write(f'{login}configure\n{config_lines}\nexit all\n')
+
+
+def check_lab(simulator, lab_path, nodes, bridge_ports):
+    ''' assert lab has nodes, ring links and management bridge ports '''
+    links = simulator.links(lab_path)
+    assert len(simulator.lab(lab_path)['nodes']) == nodes, 'node count'
+    assert sum(len(i) == 2 for i in links.values()) == nodes, 'ring link count'
+    if bridge_ports:
+        assert max(len(i) for i in links.values()) == nodes, 'management bridge ports'
+
+
+def _timeit(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def bench_size(simulator, tmp_dir, nodes, args):
+    ''' return result dict of one lab size '''
+    result = {'nodes': nodes}
+    calls_before = sum(simulator.calls.values())
+
+    # excel_topology: lab, nodes, bridge and all connections from workbook
+    lab_path = f'bench/topology_{nodes}'
+    filename = os.path.join(tmp_dir, f'topology_{nodes}.xlsx')
+    create_workbook(filename, simulator.url, lab_path, nodes, args.workers)
+    result['excel_topology'], _ = _timeit(
+        Evenger.excel_topology, filename, workers=args.workers)
+    if not args.error_rate:
+        check_lab(simulator, lab_path, nodes, bridge_ports=True)
+
+    # lab copies: clone on same server, import of one export (export time not included)
+    source_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve', lab_path=lab_path)
+    try:
+        result['clone_lab'], _ = _timeit(source_object.clone_lab, f'bench/clone_{nodes}')
+        lab_export = source_object.export_lab()
+        result['import_lab'], _ = _timeit(source_object.import_lab, lab_export, f'bench/import_{nodes}')
+    except ValueError:
+        # copy call answered with injected error (POST is not retried)
+        result.setdefault('clone_lab', float('nan'))
+        result.setdefault('import_lab', float('nan'))
+    if not args.error_rate:
+        check_lab(simulator, f'bench/clone_{nodes}', nodes, bridge_ports=True)
+        check_lab(simulator, f'bench/import_{nodes}', nodes, bridge_ports=True)
+
+    # link creation: ring links on lab with already created nodes
+    lab_path = f'bench/links_{nodes}'
+    evenger_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve',
+        lab_path=lab_path, pool_size=args.workers)
+    evenger_object.add_lab()
+    topology = Evenger.topology_load(filename)
+    Evenger._excel_rows_run(
+        evenger_object, [i for i in topology.sheet_rows if not i[0].startswith('connect_')],
+        args.workers)
+    links = [{
+        'first_node': f'node_{i}', 'first_port': '1/1/2',
+        'second_node': f'node_{(i + 1) % nodes}', 'second_port': '1/1/3'
+    } for i in range(nodes)]
+    result['connect_links'], _ = _timeit(
+        evenger_object.connect_links, links, workers=args.workers)
+    if not args.error_rate:
+        check_lab(simulator, lab_path, nodes, bridge_ports=False)
+
+    # upload_startup_configs: same config lines before nodes start
+    config_folder = os.path.join(tmp_dir, f'startup_configs_{nodes}')
+    write_configs(config_folder, nodes, args.config_lines, console=False)
+    result['startup_config'], startup_results = _timeit(
+        evenger_object.upload_startup_configs, config_folder=config_folder, workers=args.workers)
+    if not args.error_rate:
+        assert sum(1 for i in startup_results if i['status'] == 'done') == nodes, 'startup config count'
+
+    # config_with_telnet: started nodes of link lab
+    config_folder = os.path.join(tmp_dir, f'configs_{nodes}')
+    write_configs(config_folder, nodes, args.config_lines)
+    evenger_object._get(f'/api/labs/{lab_path}.unl/nodes/start')
+    result['config_with_telnet'], telnet_results = _timeit(
+        evenger_object.config_with_telnet, config_folder=config_folder, workers=args.workers)
+    result['telnet_done'] = sum(1 for i in telnet_results if i['status'] == 'done')
+    if not args.error_rate:
+        assert result['telnet_done'] == nodes, 'telnet config count'
+
+    result['api_calls'] = sum(simulator.calls.values()) - calls_before
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.002)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error_rate', type=float, default=0.0)
+    parser.add_argument('--expire_after', type=int, default=0)
+    parser.add_argument('--config_lines', type=int, default=20)
+    parser.add_argument('--json_file', default='')
+    args = parser.parse_args()
+
+    results = []
+    with EvengSimulator(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        expire_after=args.expire_after) as simulator, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        print(f'workers {args.workers}, latency {args.latency * 1000:.1f} ms, '
+              f'error rate {args.error_rate}')
+        print(f'{"nodes":>6} {"excel_topology":>15} {"clone_lab":>10} {"import_lab":>11} {"connect_links":>14} '
+              f'{"config_with_telnet":>19} {"startup_config":>15} {"api calls":>10}')
+        for nodes in args.sizes:
+            result = bench_size(simulator, tmp_dir, nodes, args)
+            results.append(result)
+            print(f'{nodes:>6} {result["excel_topology"]:>13.3f} s {result["clone_lab"]:>8.3f} s '
+                  f'{result["import_lab"]:>9.3f} s {result["connect_links"]:>12.3f} s '
+                  f'{result["config_with_telnet"]:>17.3f} s {result["startup_config"]:>13.3f} s '
+                  f'{result["api_calls"]:>10}')
+        print(f'injected api errors: {simulator.errors}')
+
+    if args.json_file:
+        with open(args.json_file, 'w') as file:
+            json.dump({'args': vars(args), 'results': results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
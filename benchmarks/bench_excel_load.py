@@ -0,0 +1,102 @@
+'''
+Benchmark excel topology load time: old (read_excel per sheet + iterrows) and
+new (openpyxl streaming Evenger._excel_topology_load) with generated large workbooks
+(pandas is only needed for old load, skipped if not installed)
+
+Run: python benchmarks/bench_excel_load.py [--nodes 200] [--links 5000]
+'''
+import argparse
+import os
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+from evenger import Evenger
+
+
+def create_workbook(filename, nodes, links):
+    ''' write evenger workbook with <nodes> linux nodes and <links> node to node rows '''
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet('_LAB_INFO')
+    sheet.append(['LAB INFORMATION'])
+    sheet.append(['', 'eveng_server_url', 'username', 'password', 'lab_path'])
+    sheet.append(['', 'http://127.0.0.1', 'admin', 'eve', 'bench/lab'])
+
+    sheet = workbook.create_sheet('add_node_linux')
+    sheet.append(['add_node_linux for linux server'])
+    sheet.append(['position', 'image', 'name', 'cpu', 'ram', 'left', 'top'])
+    for i in range(nodes):
+        sheet.append(['', 'linux-centos7', f'node_{i}', '1', '1024',
+                      str(i % 20 * 100), str(i // 20 * 100)])
+
+    sheet = workbook.create_sheet('connect_node_to_node')
+    sheet.append(['connect_node_to_node for connect node to node'])
+    sheet.append(['position', 'first_node', 'first_port',
+                  'second_node', 'second_port'])
+    for i in range(links):
+        sheet.append(['', f'node_{i % nodes}', f'e{i}',
+                      f'node_{(i + 1) % nodes}', f'e{i}'])
+    workbook.save(filename)
+
+
+def old_load(excel_filename):
+    ''' excel_topology loading before single pass load (None if pandas not installed) '''
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    pd_evenger_sheet = pd.read_excel(
+        excel_filename, sheet_name='_LAB_INFO', dtype=str, skiprows=[0]).fillna('')
+    header = [i.strip() for i in list(pd_evenger_sheet.keys())][1:]
+    for i, v in pd_evenger_sheet.iterrows():
+        v_strip = [i.strip() for i in v.to_list()[1:]]
+        lab_info = {i: j for i, j in zip(header, v_strip) if j != ''}
+        break
+    sheets = list(pd.ExcelFile(excel_filename).sheet_names)
+    dir_module_funcs = [
+        name for name in dir(Evenger) if not name.startswith('_')]
+    sheet_rows = []
+    for sheet in [i for i in sheets if i in dir_module_funcs]:
+        pd_sheet = pd.read_excel(
+            excel_filename, sheet_name=sheet, dtype=str, skiprows=[0]).fillna('')
+        header = [i.strip() for i in list(pd_sheet.keys())][1:]
+        for i, v in pd_sheet.iterrows():
+            v_strip = [i.strip() for i in v.to_list()[1:]]
+            sheet_rows.append((sheet, header, v_strip))
+    return lab_info, sheet_rows
+
+
+def _timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=200)
+    parser.add_argument('--links', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'bench_topology.xlsx')
+        create_workbook(filename, args.nodes, args.links)
+
+        old_time, old_result = _timeit(old_load, filename)
+        new_time, topology = _timeit(Evenger._excel_topology_load, filename)
+
+    print(f'rows                  : {len(topology.sheet_rows)}')
+    if old_result is None:
+        print('old load (per sheet)  : skipped (pandas not installed)')
+        print(f'new load (streaming)  : {new_time:8.3f} s')
+        return
+    assert old_result[1] == topology.sheet_rows
+    print(f'old load (per sheet)  : {old_time:8.3f} s')
+    print(f'new load (streaming)  : {new_time:8.3f} s')
+    print(f'speedup               : {old_time / new_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+Benchmark evenger import time with python -X importtime and check that heavy
+dependencies (pandas, jinja2, requests) are not imported at module load
+
+Run: python benchmarks/bench_import_time.py [--runs 5] [--max_ms 300]
+(exit code 1 if a heavy dependency is imported or import time is over --max_ms)
+'''
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ('pandas', 'jinja2', 'requests', 'openpyxl', 'numpy')
+
+
+def import_time(module):
+    ''' return (cumulative import time in ms, {top level module: cumulative ms}) '''
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True)
+    total = 0
+    modules = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        try:
+            _, cumulative, name = line.removeprefix('import time:').split('|')
+            cumulative = int(cumulative) / 1000
+        except ValueError:
+            continue
+        name = name.rstrip()
+        if name.strip() == module:
+            total = cumulative
+        modules[name.strip().split('.')[0]] = max(
+            modules.get(name.strip().split('.')[0], 0), cumulative)
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max_ms', type=float, default=300)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        total, modules = import_time('evenger')
+        totals.append(total)
+    median = statistics.median(totals)
+
+    print(f'import evenger (median of {args.runs}): {median:8.1f} ms')
+    for name, cumulative in sorted(modules.items(), key=lambda i: -i[1])[:10]:
+        print(f'  {name:30} {cumulative:8.1f} ms')
+
+    heavy = [i for i in HEAVY_MODULES if i in modules]
+    if heavy:
+        print(f'FAIL: heavy modules imported at load: {heavy}')
+        raise SystemExit(1)
+    if median > args.max_ms:
+        print(f'FAIL: import time {median:.1f} ms > {args.max_ms} ms')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
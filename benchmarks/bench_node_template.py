@@ -0,0 +1,50 @@
+'''
+Micro-benchmark node payload build: old (Jinja Template compile + render + json.loads
+per node) and new (precompiled NodeTemplate payload dict)
+
+Run: python benchmarks/bench_node_template.py [--nodes 20000]
+'''
+import argparse
+import json
+import time
+
+from jinja2 import Template
+
+from evenger import Evenger
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=20000)
+    args = parser.parse_args()
+
+    node_template = Evenger._templates['sros_cpm']
+    node_args_list = [{
+        'image': 'timoscpm-21.10.R6',
+        'name': f'7750_test_{i}',
+        'management_address': f'10.1.{i // 250}.{i % 250 + 1}/24',
+        'timos_line': 'slot=A chassis=SR-12 card=cpm5',
+        'timos_license': 'ftp://172.18.18.18/sros_vSIM_R21_license_file.txt',
+        'left': str(i % 20 * 100),
+        'top': str(i // 20 * 100)
+    } for i in range(args.nodes)]
+
+    start = time.perf_counter()
+    old_payloads = [
+        json.loads(Template(node_template.template).render(i)) for i in node_args_list
+    ]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_payloads = [node_template.payload(i) for i in node_args_list]
+    new_time = time.perf_counter() - start
+
+    assert old_payloads == new_payloads
+    print(f'nodes                         : {args.nodes}')
+    print(f'old (compile/render/parse)    : {old_time / args.nodes * 1e6:10.1f} us/node')
+    print(f'new (precompiled payload)     : {new_time / args.nodes * 1e6:10.1f} us/node')
+    print(f'speedup                       : {old_time / new_time:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
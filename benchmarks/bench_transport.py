@@ -0,0 +1,79 @@
+'''
+Benchmark old (requests.get per call) and new (Evenger pooled session) transport
+against a local keep-alive stub server
+
+Run: python benchmarks/bench_transport.py [--calls 2000]
+'''
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from evenger import Evenger
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    ''' minimal eve-ng like api, keep-alive enabled with HTTP/1.1 '''
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, no delayed ack wait on keep-alive connection
+    disable_nagle_algorithm = True
+
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if self.path == '/api/auth/login':
+            self.send_header('Set-Cookie', 'unetlab_session=stub; Path=/')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._reply({'code': 200, 'status': 'success', 'data': {}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self._reply({'code': 200, 'status': 'success', 'data': {'id': 1}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _calls_per_second(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    api = '/api/labs/bench.unl/nodes'
+
+    evenger_object = Evenger(
+        eveng_server_url=url, username='admin', password='eve', lab_path='bench')
+
+    old = _calls_per_second(
+        lambda: requests.get(f'{url}{api}', verify=False).json(), args.calls)
+    new = _calls_per_second(lambda: evenger_object._get(api), args.calls)
+
+    print(f'old transport (requests.get)   : {old:10.1f} calls/s')
+    print(f'new transport (pooled session) : {new:10.1f} calls/s')
+    print(f'speedup                        : {new / old:10.2f}x')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
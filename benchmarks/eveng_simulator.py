@@ -0,0 +1,573 @@
+'''
+In-process eve-ng stand-in for benchmarks: REST api (auth/login, list/templates, labs,
+lab clone/move/export/import, nodes, networks, interfaces, startup configs, nodes start/stop/wipe)
+and telnet node console
+
+Api server has configurable latency/jitter per call, error injection (random
+5xx status) and session expiry (412 after n calls, Evenger logs in again).
+Telnet console answers login/password prompts and echoes config lines with
+node prompt, all node consoles share one port.
+
+Usage:
+
+```py
+with EvengSimulator(latency=0.002, error_rate=0.01) as simulator:
+    evenger_object = Evenger(eveng_server_url=simulator.url, username='admin',
+                             password='eve', lab_path='bench/lab')
+    ...
+    simulator.lab('bench/lab')['nodes']
+```
+'''
+import asyncio
+import email.parser
+import email.policy
+import html
+import io
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LAB_URL = re.compile(r'^/api/labs/(.+?)\.unl(?:/(.*))?$')
+# simulated lab file: eve-ng <lab> tag and simulator state as json
+_LAB_FILE = re.compile(r'<lab name="([^"]*)" id="([^"]*)"[^>]*>.*<!\[CDATA\[(.*)\]\]>', re.S)
+
+# template: images on simulated server
+_TEMPLATES = {
+    'linux': ['linux-centos7'],
+    'timoscpm': ['timoscpm-21.10.R6'],
+    'timosiom': ['timosiom-21.10.R6']
+}
+
+# templates with startup config support (config option)
+_STARTUP_CONFIG_TEMPLATES = ('timoscpm', 'timosiom')
+
+
+def _port_names(template, ethernet):
+    ''' eve-ng interface names of node template '''
+    if template == 'timoscpm':
+        return ['Mgmt', 'SF'][:ethernet]
+    if template == 'timosiom':
+        return ['SF', *(f'1/1/{i}' for i in range(1, ethernet))][:ethernet]
+    return [f'e{i}' for i in range(ethernet)]
+
+
+class FakeTelnetConsole:
+    ''' asyncio telnet server for all node consoles, run in own thread and event loop
+
+    Session: <login: > -> any user -> <Password: > -> any password -> <prompt> and
+    each received line is echoed with prompt (empty line sends current prompt again).
+    Option negotiation (IAC DO ECHO, IAC WILL SGA) is sent on connect.
+    '''
+    IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+    ECHO, SGA = 1, 3
+
+    def __init__(self, host='127.0.0.1', prompt='node#', line_delay=0.0):
+        self.host = host
+        self.port = None
+        self.prompt = prompt
+        self.line_delay = line_delay
+        self.sessions = 0
+        self.lines = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._session, self.host, 0, backlog=1024))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def _telnet_filter(self, buffer):
+        ''' remove telnet commands from received bytes, return (data, not complete command) '''
+        data = bytearray()
+        index = 0
+        while index < len(buffer):
+            iac_index = buffer.find(self.IAC, index)
+            if iac_index == -1:
+                data += buffer[index:]
+                break
+            data += buffer[index:iac_index]
+            index = iac_index
+            if index + 1 >= len(buffer):
+                return bytes(data), buffer[index:]
+            command = buffer[index + 1]
+            if command == self.IAC:
+                data.append(self.IAC)
+                index += 2
+            elif command in (self.DO, self.DONT, self.WILL, self.WONT):
+                if index + 2 >= len(buffer):
+                    return bytes(data), buffer[index:]
+                index += 3
+            else:
+                index += 2
+        return bytes(data), b''
+
+    async def _session(self, reader, writer):
+        self.sessions += 1
+        writer.write(bytes([self.IAC, self.DO, self.ECHO, self.IAC, self.WILL, self.SGA]))
+        prompts = ['login: ', 'Password: ', f'{self.prompt} ']
+        state = 0
+        writer.write(f'\r\n{prompts[state]}'.encode())
+        pending = b''
+        line_buffer = b''
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                data, pending = self._telnet_filter(pending + chunk)
+                line_buffer += data.replace(b'\r', b'')
+                while b'\n' in line_buffer:
+                    line, line_buffer = line_buffer.split(b'\n', 1)
+                    if self.line_delay:
+                        await asyncio.sleep(self.line_delay)
+                    if line and state < 2:
+                        state += 1
+                        echo = b'' if state == 2 else line
+                    else:
+                        echo = line
+                        self.lines += bool(line)
+                    writer.write(echo + f'\r\n{prompts[state]}'.encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    ''' eve-ng like api request handler, state and options are in server.simulator '''
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, no delayed ack wait on keep-alive connection
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code, data=None, message='', headers=()):
+        if isinstance(data, bytes):
+            # file download (lab export zip)
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        body = {'code': code, 'status': 'success' if code < 400 else 'fail',
+                'message': message}
+        if data is not None:
+            body['data'] = data
+        body = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for header in headers:
+            self.send_header(*header)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        simulator = self.server.simulator
+        length = int(self.headers.get('Content-Length', 0))
+        raw_body = self.rfile.read(length) if length else b''
+        content_type = self.headers.get('Content-Type', '')
+        try:
+            if content_type.startswith('multipart/form-data'):
+                body = self._form_data(content_type, raw_body)
+            else:
+                body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return self._reply(400, message='Invalid json')
+        cookie = self.headers.get('Cookie', '')
+        session = cookie.partition('unetlab_session=')[2].split(';')[0]
+        code, data, message, headers = simulator.handle(method, self.path, body, session)
+        self._reply(code, data, message, headers)
+
+    @staticmethod
+    def _form_data(content_type, raw_body):
+        ''' {field name: bytes} of multipart form body '''
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + raw_body)
+        return {part.get_param('name', header='content-disposition'): part.get_payload(decode=True)
+                for part in message.iter_parts()}
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class EvengSimulator:
+    ''' in-process eve-ng api server with lab state and fake telnet console
+
+    ### Args:
+        - latency (optional) : 0.0 (seconds added to each api call)
+        - jitter (optional) : 0.0 (random 0..jitter seconds added to latency)
+        - error_rate (optional) : 0.0 (part of api calls answered with error_status, login excluded)
+        - error_status (optional) : 500
+        - expire_after (optional) : 0 (session expires after n api calls, 0 never)
+        - boot_time (optional) : 0.0 (seconds after node start until node status is running)
+        - seed (optional) : 1 (random seed for jitter and errors)
+        - console_line_delay (optional) : 0.0 (seconds before telnet console answers a line)
+        - templates (optional) : {template: [image, ...]} (default: linux, timoscpm and timosiom)
+
+    '''
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=500, expire_after=0,
+                 boot_time=0.0, seed=1, console_line_delay=0.0, templates=None):
+        self.templates = _TEMPLATES if templates is None else templates
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.expire_after = expire_after
+        self.boot_time = boot_time
+        self.labs = {}
+        self.calls = Counter()
+        self.errors = 0
+        self.console = FakeTelnetConsole(line_delay=console_line_delay)
+        self._random = random.Random(seed)
+        self._sessions = {}
+        self._ids = itertools.count(1)
+        self._exports = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def start(self):
+        self.console.start()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _ApiHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.console.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def lab(self, lab_path):
+        ''' lab state dict {'lab': lab dict, 'nodes': {id: node}, 'networks': {id: network}} '''
+        return self.labs[lab_path.strip('/')]
+
+    def links(self, lab_path):
+        ''' {network_id: [(node name, interface name), ...]} of networks with attached interfaces '''
+        lab = self.lab(lab_path)
+        links = {}
+        for node in lab['nodes'].values():
+            for interface in node['_interfaces']:
+                if interface['network_id']:
+                    links.setdefault(str(interface['network_id']), []).append(
+                        (node['name'], interface['name']))
+        return links
+
+    def handle(self, method, path, body, session):
+        ''' return (status code, data, message, headers) of api call '''
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            inject_error = self.error_rate and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        path = path.split('?')[0]
+        with self._lock:
+            self.calls[method] += 1
+            if path == '/api/auth/login' and method == 'POST':
+                session = f'sim{next(self._ids)}'
+                self._sessions[session] = 0
+                return 200, None, 'User logged in', [
+                    ('Set-Cookie', f'unetlab_session={session}; Path=/')]
+            if session not in self._sessions:
+                return 412, None, 'User is not authenticated (90001)', []
+            self._sessions[session] += 1
+            if self.expire_after and self._sessions[session] > self.expire_after:
+                del self._sessions[session]
+                return 412, None, 'Session timed out (90001)', []
+            if inject_error:
+                self.errors += 1
+                return self.error_status, None, 'Injected error', []
+            try:
+                return self._route(method, path, body)
+            except (KeyError, ValueError, TypeError) as e:
+                return 400, None, f'Bad request: {e}', []
+
+    def _route(self, method, path, body):
+        if path == '/api/labs' and method == 'POST':
+            if 'source' in body:
+                # clone: copy of source lab file in source lab folder, new lab id
+                source = body['source'].strip('/').removesuffix('.unl')
+                if source not in self.labs:
+                    return 404, None, 'Lab does not exist (60038)', []
+                lab_path = '/'.join(i for i in (source.rpartition('/')[0], body['name']) if i)
+                if lab_path in self.labs:
+                    return 400, None, 'Lab already exists (60016)', []
+                self.labs[lab_path] = self._lab_load(
+                    self._lab_file(self.labs[source]), body['name'], str(uuid.uuid4()))
+                return 200, None, 'Lab has been cloned (60036)', []
+            lab_path = '/'.join(
+                i for i in (body.get('path', '').strip('/'), body.get('name', '')) if i)
+            if lab_path in self.labs:
+                return 400, None, 'Lab already exists (60016)', []
+            self.labs[lab_path] = {'lab': {**body, 'id': str(uuid.uuid4())}, 'nodes': {}, 'networks': {},
+                                   '_ids': itertools.count(1)}
+            return 200, None, 'Lab has been created (60019)', []
+
+        if path == '/api/export' and method == 'POST':
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w') as export_zip:
+                for key, lab_file in body.items():
+                    if key == 'path':
+                        continue
+                    lab_path = lab_file.strip('/').removesuffix('.unl')
+                    if lab_path not in self.labs:
+                        return 404, None, 'Lab does not exist (60038)', []
+                    export_zip.writestr(
+                        f'{lab_path.rpartition("/")[2]}.unl', self._lab_file(self.labs[lab_path]))
+            export_path = f'/Exports/unetlab_export-{next(self._ids)}.zip'
+            self._exports[export_path] = buffer.getvalue()
+            return 200, export_path, 'Lab(s) exported (60055)', []
+
+        if path in self._exports and method == 'GET':
+            return 200, self._exports[path], '', []
+
+        if path == '/api/import' and method == 'POST':
+            folder = body.get('path', b'/').decode().strip('/')
+            lab_ids = {i['lab'].get('id') for i in self.labs.values()}
+            with zipfile.ZipFile(io.BytesIO(body['file'])) as import_zip:
+                for filename in import_zip.namelist():
+                    lab_path = '/'.join(i for i in (folder, filename.removesuffix('.unl')) if i)
+                    lab = self._lab_load(import_zip.read(filename).decode())
+                    if lab_path in self.labs:
+                        return 400, None, 'Lab already exists (60016)', []
+                    if lab['lab']['id'] in lab_ids:
+                        return 400, None, 'Lab id already exists', []
+                    self.labs[lab_path] = lab
+            return 200, None, 'Lab(s) imported (60056)', []
+
+        if path.startswith('/api/list/templates/') and method == 'GET':
+            template = path.removeprefix('/api/list/templates/').strip('/')
+            if not template:
+                return 200, {i: i.upper() for i in self.templates}, 'Successfully listed node templates (60003)', []
+            if template not in self.templates:
+                return 404, None, 'Template does not exist (60004)', []
+            images = self.templates[template]
+            options = {
+                'image': {'list': {i: i for i in images} or [], 'value': images[0] if images else ''},
+                'ethernet': {'value': 4}}
+            if template in _STARTUP_CONFIG_TEMPLATES:
+                options['config'] = {'list': {'0': 'None', '1': 'Exported'}, 'value': '0'}
+            return 200, {'type': 'qemu', 'options': options}, '', []
+
+        match = _LAB_URL.match(path)
+        if not match or match.group(1).strip('/') not in self.labs:
+            return 404, None, 'Lab does not exist (60038)', []
+        lab_path, sub_path = match.group(1).strip('/'), match.group(2) or ''
+        lab = self.labs[lab_path]
+        parts = sub_path.split('/') if sub_path else []
+
+        if parts == ['move'] and method == 'PUT':
+            new_path = '/'.join(
+                i for i in (body['path'].strip('/'), lab_path.rpartition('/')[2]) if i)
+            if new_path in self.labs:
+                return 400, None, 'Lab already exists (60016)', []
+            self.labs[new_path] = self.labs.pop(lab_path)
+            return 200, None, 'Lab has been moved (60035)', []
+        if not parts:
+            if method == 'DELETE':
+                del self.labs[lab_path]
+                return 200, None, 'Lab has been deleted (60022)', []
+            return 200, lab['lab'], 'Lab has been loaded (60020)', []
+        if parts[0] == 'nodes':
+            return self._route_nodes(method, lab, parts[1:], body)
+        if parts[0] == 'networks':
+            return self._route_networks(method, lab, parts[1:], body)
+        if parts[0] == 'configs':
+            return self._route_configs(method, lab, parts[1:], body)
+        return 404, None, 'Not found', []
+
+    @staticmethod
+    def _lab_file(lab):
+        ''' lab file text of lab state (nodes are stopped in file) '''
+        nodes = {k: {i: j for i, j in v.items() if i != 'started'} for k, v in lab['nodes'].items()}
+        state = json.dumps({'lab': lab['lab'], 'nodes': nodes, 'networks': lab['networks']})
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<lab name="{html.escape(lab["lab"].get("name", ""))}" id="{lab["lab"].get("id", "")}" '
+                f'version="1" scripttimeout="300" lock="0">\n'
+                f'  <simulator><![CDATA[{state}]]></simulator>\n</lab>\n')
+
+    @staticmethod
+    def _lab_load(lab_text, name=None, lab_id=None):
+        ''' lab state of lab file text, name/id of <lab> tag if not set '''
+        match = _LAB_FILE.match(lab_text.partition('\n')[2])
+        if match is None:
+            raise ValueError('lab file not valid')
+        state = json.loads(match.group(3))
+        state['lab'].update(name=name or html.unescape(match.group(1)), id=lab_id or match.group(2))
+        for node in state['nodes'].values():
+            node['status'] = 0
+        state['_ids'] = itertools.count(
+            max(map(int, [*state['nodes'], *state['networks']]), default=0) + 1)
+        return state
+
+    @staticmethod
+    def _public(item):
+        return {k: v for k, v in item.items() if not k.startswith('_')}
+
+    def _node_view(self, node):
+        ''' node dict with status from boot time '''
+        node = self._public(node)
+        started = node.pop('started', None)
+        if started is not None:
+            node['status'] = 2 if time.monotonic() - started >= self.boot_time else 1
+        return node
+
+    def _route_nodes(self, method, lab, parts, body):
+        nodes = lab['nodes']
+        if not parts:
+            if method == 'GET':
+                # eve-ng returns empty list for lab without node
+                return 200, {k: self._node_view(v) for k, v in nodes.items()} or [], '', []
+            if method == 'POST':
+                node_id = str(next(lab['_ids']))
+                console = body.get('console', 'telnet')
+                node = {**body, 'id': int(node_id), 'status': 0,
+                        'url': f'{console}://127.0.0.1:{self.console.port}'}
+                node['_interfaces'] = [
+                    {'name': i, 'network_id': 0}
+                    for i in _port_names(body.get('template'), int(body.get('ethernet', 4)))]
+                nodes[node_id] = node
+                return 201, {'id': int(node_id)}, 'Lab has been saved (60023)', []
+            return 405, None, 'Method not allowed', []
+
+        if parts[0] == 'start' and method == 'GET':
+            for node in nodes.values():
+                node.setdefault('started', time.monotonic())
+            return 200, None, 'Nodes started (80049)', []
+        node = nodes.get(parts[0])
+        if node is None:
+            return 404, None, 'Node does not exist (20024)', []
+        action = parts[1] if len(parts) > 1 else ''
+        if action == 'interfaces':
+            if method == 'GET':
+                return 200, {'ethernet': [dict(i) for i in node['_interfaces']],
+                             'serial': []}, '', []
+            if method == 'PUT':
+                for int_id, network_id in body.items():
+                    if str(network_id) not in ('', '0') and str(network_id) not in lab['networks']:
+                        return 404, None, 'Network does not exist (20028)', []
+                    node['_interfaces'][int(int_id)]['network_id'] = int(network_id or 0)
+                return 201, None, 'Lab has been saved (60023)', []
+        elif action == 'start':
+            node.setdefault('started', time.monotonic())
+            return 200, None, 'Node started (80049)', []
+        elif action == 'stop':
+            node.pop('started', None)
+            node['status'] = 0
+            return 200, None, 'Node stopped (80051)', []
+        elif action == 'wipe':
+            return 200, None, 'Node cleared (80053)', []
+        elif not action:
+            if method == 'GET':
+                return 200, self._node_view(node), '', []
+            if method == 'PUT':
+                node.update(body)
+                return 201, None, 'Lab has been saved (60023)', []
+            if method == 'DELETE':
+                del nodes[parts[0]]
+                return 201, None, 'Node deleted (60023)', []
+        return 404, None, 'Not found', []
+
+    def _route_networks(self, method, lab, parts, body):
+        networks = lab['networks']
+        if not parts:
+            if method == 'GET':
+                used = Counter(
+                    str(i['network_id']) for node in lab['nodes'].values()
+                    for i in node['_interfaces'] if i['network_id'])
+                # eve-ng returns empty list for lab without network
+                return 200, {k: {**v, 'count': used[k]} for k, v in networks.items()} or [], '', []
+            if method == 'POST':
+                network_id = str(next(lab['_ids']))
+                networks[network_id] = {'visibility': 1, **body, 'id': int(network_id)}
+                return 201, {'id': int(network_id)}, 'Network has been added (20019)', []
+            return 405, None, 'Method not allowed', []
+        network = networks.get(parts[0])
+        if network is None:
+            return 404, None, 'Network does not exist (20028)', []
+        if method == 'GET':
+            return 200, dict(network), '', []
+        if method == 'PUT':
+            network.update(body)
+            return 201, None, 'Lab has been saved (60023)', []
+        if method == 'DELETE':
+            del networks[parts[0]]
+            for node in lab['nodes'].values():
+                for interface in node['_interfaces']:
+                    if str(interface['network_id']) == parts[0]:
+                        interface['network_id'] = 0
+            return 201, None, 'Network has been deleted (20021)', []
+        return 405, None, 'Method not allowed', []
+
+    @staticmethod
+    def _route_configs(method, lab, parts, body):
+        nodes = lab['nodes']
+        if not parts:
+            if method == 'GET':
+                return 200, {k: {'name': v['name'], 'config': v.get('config', '0')}
+                             for k, v in nodes.items()}, '', []
+            return 405, None, 'Method not allowed', []
+        node = nodes.get(parts[0])
+        if node is None:
+            return 404, None, 'Node does not exist (20024)', []
+        if method == 'GET':
+            return 200, {'id': node['id'], 'name': node['name'],
+                         'data': node.get('_startup_config', '')}, '', []
+        if method == 'PUT':
+            node['_startup_config'] = body['data']
+            return 201, None, 'Lab has been saved (60023)', []
+        return 405, None, 'Method not allowed', []
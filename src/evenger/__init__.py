@@ -1 +1 @@
-from .evenger import Evenger
+from .evenger import Evenger, setup_logging
@@ -4,28 +4,570 @@ Evenger create EVE-NG network topology with EVE-NG API and excel file
 Version: 2023.01.16
 '''
 import argparse
+import asyncio
+import copy
+import functools
+import io
 import json
 import logging
+import math
 import os
-import telnetlib
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 
-import pandas as pd
-import requests
-from jinja2 import Template
+# openpyxl, jinja2 and requests are imported on first use for fast import and CLI startup
 
-# LOG OPTIONS
-logging.basicConfig(
-    handlers=[
-        logging.StreamHandler()
-    ],
-    format='%(asctime)s.%(msecs)03d %(levelname)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    level='INFO'
-)
+# package logger, handlers/level are set by application or <setup_logging> (CLI)
+logger = logging.getLogger('evenger')
 
-requests.packages.urllib3.disable_warnings()
+
+class TelnetConsole:
+    """ asyncio telnet console client for eve-ng node consoles
+
+    All received data is kept in one transcript buffer, expect string is searched
+    incrementally in not consumed data while data arrives. Telnet option
+    negotiation is refused (same as telnetlib).
+    """
+    IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = bytearray()
+        self._scanned = 0
+        self._transcript = io.BytesIO()
+        self._telnet_command = b''
+        self._data_event = asyncio.Event()
+        self._eof = False
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def open(cls, host, port, timeout=10):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, int(port)), timeout)
+        return cls(reader, writer)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                chunk = await self._reader.read(65536)
+                if not chunk:
+                    break
+                data = self._telnet_filter(chunk)
+                if data:
+                    self._pending += data
+                    self._transcript.write(data)
+                    self._data_event.set()
+        except ConnectionError:
+            pass
+        finally:
+            self._eof = True
+            self._data_event.set()
+
+    def _telnet_filter(self, chunk):
+        """ remove telnet commands from chunk, answer DO/WILL with WONT/DONT """
+        buffer = self._telnet_command + chunk
+        self._telnet_command = b''
+        data = bytearray()
+        index = 0
+        while index < len(buffer):
+            iac_index = buffer.find(self.IAC, index)
+            if iac_index == -1:
+                data += buffer[index:]
+                break
+            data += buffer[index:iac_index]
+            index = iac_index
+            if index + 1 >= len(buffer):
+                self._telnet_command = buffer[index:]
+                break
+            command = buffer[index + 1]
+            if command == self.IAC:
+                data.append(self.IAC)
+                index += 2
+            elif command in (self.DO, self.DONT, self.WILL, self.WONT):
+                if index + 2 >= len(buffer):
+                    self._telnet_command = buffer[index:]
+                    break
+                if command == self.DO:
+                    self._writer.write(bytes([self.IAC, self.WONT, buffer[index + 2]]))
+                elif command == self.WILL:
+                    self._writer.write(bytes([self.IAC, self.DONT, buffer[index + 2]]))
+                index += 3
+            elif command == self.SB:
+                se_index = buffer.find(bytes([self.IAC, self.SE]), index + 2)
+                if se_index == -1:
+                    self._telnet_command = buffer[index:]
+                    break
+                index = se_index + 2
+            else:
+                index += 2
+        return bytes(data).replace(b'\x00', b'')
+
+    def _consume(self, end):
+        del self._pending[:end]
+        self._scanned = 0
+
+    async def read_until(self, expected, timeout, consume=True):
+        """ wait expected bytes in not consumed data and consume until end of it
+        (consume all received data after timeout, same as telnetlib read_until)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            index = self._pending.find(expected, self._scanned)
+            if index != -1:
+                if consume:
+                    self._consume(index + len(expected))
+                else:
+                    self._scanned = 0
+                return True
+            # next search only in new data (with expected length overlap)
+            self._scanned = max(0, len(self._pending) - len(expected) + 1)
+            remaining = deadline - loop.time()
+            if self._eof or remaining <= 0:
+                self._consume(len(self._pending))
+                return False
+            self._data_event.clear()
+            try:
+                await asyncio.wait_for(self._data_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def wait_prompt(self, expected, deadline, interval=5):
+        """ send new line every interval until expected received or deadline (loop time)
+        (expected is not consumed, next read_until finds it)
+        """
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            self._writer.write(b'\n')
+            await self._writer.drain()
+            timeout = min(interval, deadline - loop.time())
+            if await self.read_until(expected, timeout, consume=False):
+                return True
+            if self._eof:
+                return False
+        return False
+
+    async def write(self, line):
+        """ send line, consume already received data (same as telnetlib read_eager) """
+        self._writer.write(line.encode('ascii') + b'\n')
+        await self._writer.drain()
+        self._consume(len(self._pending))
+
+    def transcript(self):
+        return self._transcript.getvalue().decode('ascii', errors='replace')
+
+    async def close(self):
+        self._read_task.cancel()
+        self._writer.close()
+        try:
+            await self._read_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+class LookupCache:
+    """ thread-safe name/id lookup cache with optional ttl
+
+    ### Args:
+        - fetch_all (optional) : function returns all {name: value} with one api call
+        - fetch_one (optional) : function returns value of one name
+        - ttl (optional) : 0 (seconds, 0 means entries never expire)
+
+    Missing or expired name is fetched again with fetch_one or fetch_all.
+    """
+
+    def __init__(self, fetch_all=None, fetch_one=None, ttl=0):
+        self._fetch_all = fetch_all
+        self._fetch_one = fetch_one
+        self.ttl = ttl
+        self._entries = {}
+        self._loaded_time = None
+        self._lock = threading.Lock()
+
+    def _expired(self, entry_time):
+        return bool(self.ttl) and time.monotonic() - entry_time > self.ttl
+
+    def refresh(self):
+        """ fetch all entries again (fetch_all) """
+        entries = self._fetch_all()
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {k: (v, now) for k, v in entries.items()}
+            self._loaded_time = now
+
+    def get_all(self):
+        """ return {name: value} of all not expired entries """
+        if self._fetch_all and (
+                self._loaded_time is None or self._expired(self._loaded_time)):
+            self.refresh()
+        with self._lock:
+            return {k: v for k, (v, t) in self._entries.items() if not self._expired(t)}
+
+    def get(self, name):
+        """ return value of name, raise KeyError if not exist after fetch """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and not self._expired(entry[1]):
+            return entry[0]
+        if self._fetch_one:
+            value = self._fetch_one(name)
+            self.set(name, value)
+            return value
+        self.refresh()
+        with self._lock:
+            return self._entries[name][0]
+
+    def set(self, name, value):
+        """ write entry (e.g. id returned from api) """
+        with self._lock:
+            self._entries[name] = (value, time.monotonic())
+
+    def invalidate(self, name=None, value=None):
+        """ remove name (only if its value equal to value, if set) or all entries
+
+        Next get_all fetches all entries again, so removed name is not missing from it.
+        """
+        with self._lock:
+            if name is None:
+                self._entries = {}
+                self._loaded_time = None
+            elif value is None or self._entries.get(name, (None,))[0] == value:
+                self._entries.pop(name, None)
+                self._loaded_time = None
+
+
+class NodeTemplate:
+    """ compiled eve-ng json payload template
+
+    ### Args:
+        - template : json text (Jinja template) or dict, with {{arg}} in string values
+
+    Json template with only {{arg}} placeholders is compiled once and payload dict
+    is built directly from args (missing arg is empty string, same as Jinja).
+    Other templates (e.g. Jinja filters or loops) are rendered with Jinja and parsed.
+    """
+    _PLACEHOLDER = re.compile(r'{{\s*(\w+)\s*}}')
+    _cache = {}
+
+    def __init__(self, template):
+        self.template = template
+        self._jinja = None
+        self._base = {}
+        self._fields = []
+        try:
+            template_dict = json.loads(template) if isinstance(
+                template, str) else dict(template)
+        except ValueError:
+            self._jinja = self._jinja_template(template)
+            return
+        # base keeps template key order, placeholder values are replaced in payload
+        self._base = template_dict
+        for key, value in template_dict.items():
+            if isinstance(value, str) and '{' in value:
+                parts = self._PLACEHOLDER.split(value)
+                if any('{{' in i or '{%' in i for i in parts[::2]):
+                    self._jinja = self._jinja_template(
+                        template if isinstance(template, str) else json.dumps(template))
+                    return
+                self._fields.append((key, parts))
+
+    @staticmethod
+    def _jinja_template(template_text):
+        from jinja2 import Template
+        return Template(template_text)
+
+    @classmethod
+    def cached(cls, template_text):
+        """ compiled template of text, compiled once per text """
+        node_template = cls._cache.get(template_text)
+        if node_template is None:
+            node_template = cls._cache[template_text] = cls(template_text)
+        return node_template
+
+    def payload(self, args):
+        """ payload dict for args """
+        if self._jinja:
+            return json.loads(self._jinja.render(args))
+        payload = dict(self._base)
+        for key, parts in self._fields:
+            payload[key] = ''.join(
+                str(args.get(j, '')) if i % 2 else j for i, j in enumerate(parts))
+        return payload
+
+
+class ConfigRenderer:
+    """ node config rendering with one Jinja template per role, each template is compiled once
+
+    ### Args:
+        - template_folder : configs (role templates <role>.j2, may include other templates of folder)
+
+    Missing template variable is an error of that node (StrictUndefined), not empty text.
+    """
+
+    def __init__(self, template_folder):
+        from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+        self.template_folder = template_folder
+        self._environment = Environment(
+            loader=FileSystemLoader(template_folder), undefined=StrictUndefined,
+            keep_trailing_newline=True, auto_reload=False)
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def template(self, role):
+        """ compiled template of role (<template_folder>/<role>.j2) """
+        template = self._templates.get(role)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(role)
+                if template is None:
+                    template = self._templates[role] = self._environment.get_template(f'{role}.j2')
+        return template
+
+    def render(self, role, variables):
+        """ config text of role template with variables """
+        return self.template(role).render(variables)
+
+    def node_configs(self, node_variables):
+        """ {node_name: function returns rendered config} of {node_name: {'config_template': role, ...}}
+        (all role templates are compiled here, configs are rendered on use)
+        """
+        for variables in node_variables.values():
+            self.template(variables['config_template'])
+        return {
+            node_name: functools.partial(self.render, variables['config_template'], variables)
+            for node_name, variables in node_variables.items()
+        }
+
+
+class BuildJournal:
+    """ on-disk build journal, one json line per completed step with returned result (e.g. node id)
+
+    ### Args:
+        - filename : evenger_topology.xlsx.journal
+        - resume (optional) : False (True keeps completed steps of existing journal, False starts new journal)
+
+    """
+
+    def __init__(self, filename, resume=False):
+        self.filename = filename
+        self._completed = {}
+        self._lock = threading.Lock()
+        if resume and os.path.exists(filename):
+            with open(filename) as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # last line of interrupted run
+                        continue
+                    self._completed[entry['step']] = entry.get('result')
+            logger.info(
+                'Journal <%s> loaded, %s completed steps', filename, len(self._completed))
+        self._file = open(filename, 'a' if resume else 'w')
+
+    @staticmethod
+    def row_step(sheet, v_strip):
+        return f'{sheet} {json.dumps(v_strip)}'
+
+    def done(self, step):
+        return step in self._completed
+
+    def result(self, step):
+        return self._completed.get(step)
+
+    def record(self, step, result=None):
+        """ write completed step, flushed to disk immediately """
+        with self._lock:
+            self._completed[step] = result
+            self._file.write(json.dumps(
+                {'step': step, 'result': result}, default=str) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CallStats:
+    """ thread-safe api call/telnet session timing records with per operation histograms
+
+    ### Args:
+        - hook (optional) : function(record) called after each record e.g. for external metrics
+        - max_records (optional) : 10000 (latest records kept for timeline report, None keeps all)
+
+    Each record is dict with start (seconds from CallStats creation), operation, method,
+    endpoint (ids replaced with {id}, lab path with {lab}), status, latency (seconds),
+    request_bytes, response_bytes and thread. Histogram counts are kept for all records,
+    p50/p95 are of latest <_SAMPLE_SIZE> latencies per operation.
+    """
+    _ID = re.compile(r'/\d+(?=/|$)')
+    # histogram bucket upper bounds (seconds)
+    _BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+    # latencies kept per operation for p50/p95
+    _SAMPLE_SIZE = 10000
+
+    def __init__(self, hook=None, max_records=10000):
+        self.hook = hook
+        self.records = deque(maxlen=max_records)
+        # operation: running count, errors, total, max, buckets and latency sample
+        self._operations = {}
+        self._start = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint(url, lab_path=''):
+        """ endpoint template of api url e.g. /api/labs/{lab}/nodes/{id}/interfaces """
+        if lab_path:
+            url = url.replace(f'/api/labs/{lab_path}.unl', '/api/labs/{lab}')
+        return CallStats._ID.sub('/{id}', url)
+
+    @contextmanager
+    def operation(self, name):
+        """ label records of current thread with operation name (outer operation label is kept) """
+        if getattr(self._local, 'operation', None):
+            yield
+            return
+        self._local.operation = name
+        try:
+            yield
+        finally:
+            self._local.operation = None
+
+    def bind(self, func):
+        """ wrap func to run with operation label of current thread (e.g. for thread pool tasks) """
+        name = getattr(self._local, 'operation', None)
+        if not name:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with self.operation(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def record(self, method, endpoint, status, latency, request_bytes=0, response_bytes=0, operation=None):
+        """ add timing record, operation is label of current thread if not set """
+        record = {
+            'start': round(time.perf_counter() - self._start - latency, 6),
+            'operation': operation or getattr(self._local, 'operation', None) or 'api',
+            'method': method,
+            'endpoint': endpoint,
+            'status': status,
+            'latency': round(latency, 6),
+            'request_bytes': request_bytes,
+            'response_bytes': response_bytes,
+            'thread': threading.current_thread().name
+        }
+        with self._lock:
+            self.records.append(record)
+            self._operation_add(record)
+        if self.hook:
+            try:
+                self.hook(record)
+            except Exception as e:
+                logger.error('Call stats hook failed: %s', e)
+
+    def _operation_add(self, record):
+        """ add record to running histogram of its operation (called with lock) """
+        histogram = self._operations.get(record['operation'])
+        if histogram is None:
+            buckets = {f'<={i}s': 0 for i in self._BUCKETS}
+            buckets[f'>{self._BUCKETS[-1]}s'] = 0
+            histogram = self._operations[record['operation']] = {
+                'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0, 'buckets': buckets,
+                'latencies': deque(maxlen=self._SAMPLE_SIZE)}
+        value = record['latency']
+        histogram['count'] += 1
+        if not str(record['status']).startswith(('2', 'done')):
+            histogram['errors'] += 1
+        histogram['total'] += value
+        histogram['max'] = max(histogram['max'], value)
+        histogram['buckets'][next(
+            (f'<={i}s' for i in self._BUCKETS if value <= i), f'>{self._BUCKETS[-1]}s')] += 1
+        histogram['latencies'].append(value)
+
+    def histograms(self):
+        """ return {operation: {count, errors, total, mean, p50, p95, max, buckets}} (seconds) """
+        with self._lock:
+            operations = {
+                k: {**v, 'buckets': dict(v['buckets']), 'latencies': sorted(v['latencies'])}
+                for k, v in self._operations.items()}
+        histograms = {}
+        for operation, histogram in operations.items():
+            values = histogram['latencies']
+            histograms[operation] = {
+                'count': histogram['count'],
+                'errors': histogram['errors'],
+                'total': round(histogram['total'], 3),
+                'mean': round(histogram['total'] / histogram['count'], 6),
+                'p50': values[(len(values) - 1) // 2],
+                'p95': values[int((len(values) - 1) * 0.95)],
+                'max': histogram['max'],
+                'buckets': histogram['buckets']
+            }
+        return histograms
+
+    def log_summary(self):
+        """ log one line per operation """
+        for operation, histogram in self.histograms().items():
+            logger.info(
+                'Call stats %s: count=%s errors=%s total=%ss p50=%ss p95=%ss max=%ss',
+                operation, histogram['count'], histogram['errors'], histogram['total'],
+                histogram['p50'], histogram['p95'], histogram['max'])
+
+    def write_report(self, filename):
+        """ write timeline report, csv (one row per record) or json (histograms and records) by file suffix
+        (latest max_records records)
+        """
+        with self._lock:
+            records = list(self.records)
+        if filename.lower().endswith('.csv'):
+            import csv
+
+            with open(filename, 'w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=[
+                    'start', 'operation', 'method', 'endpoint', 'status', 'latency',
+                    'request_bytes', 'response_bytes', 'thread'])
+                writer.writeheader()
+                writer.writerows(records)
+        else:
+            with open(filename, 'w') as file:
+                json.dump({'histograms': self.histograms(), 'calls': records}, file, indent=1)
+        logger.info('Timeline report <%s> written, %s records', filename, len(records))
+
+
+def _timed_operation(name):
+    """ Evenger method decorator, label api calls of method with operation name (look <CallStats>) """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.call_stats.operation(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@dataclass
+class Topology:
+    """ in-memory topology model
+
+    ### Args:
+        - lab_info : Evenger object args e.g. {'eveng_server_url': 'http://172.18.18.18', ...}
+        - sheet_rows : [(evenger function name, header list, value list), ...]
+
+    """
+    lab_info: dict
+    sheet_rows: list
 
 
 @dataclass
@@ -37,18 +579,241 @@ class Evenger:
         - username : admin
         - password : admin
         - lab_path : my_lab_folder/my_lab_1
+        - pool_size (optional) : 10 (max keep-alive connections to eve-ng server)
+        - timeout (optional) : 30 (seconds, per request)
+        - retries (optional) : 3 (retry count for 5xx errors and connection resets)
+        - backoff_factor (optional) : 0.5 (seconds, retry backoff factor)
+        - cache_ttl (optional) : 0 (seconds, node/bridge/interface lookup cache ttl, 0 means no expire)
+        - call_hook (optional) : function(record) called after each api call and telnet session
+          (timing records are also kept in <call_stats>, look <CallStats>)
 
     """
     eveng_server_url: str
     username: str
     password: str
     lab_path: str
+    pool_size: int = 10
+    timeout: float = 30
+    retries: int = 3
+    backoff_factor: float = 0.5
+    cache_ttl: float = 0
+    call_hook: object = None
+
+    # node/lab/network payload templates, compiled once
+    _templates = {
+        'lab': NodeTemplate('''
+        {
+        "author": "",
+        "description": "{{description}}",
+        "scripttimeout": 300,
+        "version": 1,
+        "name": "{{name}}",
+        "body": "",
+        "path": "{{path}}"
+        }
+        '''),
+        'network': NodeTemplate('''
+        {
+        "count": "1",
+        "visibility": "{{visibility}}",
+        "name": "{{name}}",
+        "type": "{{type}}",
+        "left": "{{left}}",
+        "top": "{{top}}",
+        "postfix": 0
+        }
+        '''),
+        'sros_cpm': NodeTemplate('''
+        {
+        "template":"timoscpm",
+        "type":"qemu",
+        "count":"1",
+        "image":"{{image}}",
+        "name":"{{name}}",
+        "icon":"SROS.png",
+        "uuid":"",
+        "cpulimit":"undefined",
+        "cpu":"1",
+        "ram":"2048",
+        "ethernet":"2",
+        "management_address":"{{management_address}}",
+        "timos_line":"{{timos_line}}",
+        "timos_license":"{{timos_license}}",
+        "qemu_version":"","qemu_arch":"",
+        "qemu_nic":"",
+        "qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
+        "ro_qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
+        "config":"0",
+        "delay":"0",
+        "console":"telnet",
+        "left":"{{left}}",
+        "top":"{{top}}",
+        "postfix":0
+        }
+        '''),
+        'sros_iom': NodeTemplate('''
+        {
+        "template":"timosiom",
+        "type":"qemu",
+        "count":"1",
+        "image":"{{image}}",
+        "name":"{{name}}",
+        "icon":"SROS linecard.png",
+        "uuid":"",
+        "cpulimit":"undefined",
+        "cpu":"1",
+        "ram":"2048",
+        "ethernet":"10",
+        "timos_line":"{{timos_line}}",
+        "qemu_version":"",
+        "qemu_arch":"",
+        "qemu_nic":"",
+        "qemu_options": "-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
+        "ro_qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
+        "config":"0",
+        "delay":"0",
+        "console":"telnet",
+        "left":"{{left}}",
+        "top":"{{top}}",
+        "postfix":0
+        }
+        '''),
+        'linux': NodeTemplate('''
+        {
+        "template": "linux",
+        "type": "qemu",
+        "count": "1",
+        "image": "{{image}}",
+        "name": "{{name}}",
+        "icon": "Server.png",
+        "uuid": "",
+        "cpulimit": "undefined",
+        "cpu": "{{cpu}}",
+        "ram": "{{ram}}",
+        "ethernet": "2",
+        "firstmac": "",
+        "qemu_version": "",
+        "qemu_arch": "",
+        "qemu_nic": "",
+        "qemu_options": "-machine type=pc,accel=kvm -vga virtio -usbdevice tablet -boot order=cd",
+        "ro_qemu_options": "-machine type=pc,accel=kvm -vga virtio -usbdevice tablet -boot order=cd",
+        "config": "0",
+        "delay": "0",
+        "console": "vnc",
+        "left": "{{left}}",
+        "top": "{{top}}",
+        "postfix": 0
+        }
+        '''),
+    }
+
+    # topology readers by file suffix (function or Evenger static method name)
+    _topology_readers = {
+        '.xlsx': '_excel_topology_load',
+        '.xlsm': '_excel_topology_load',
+        '.yaml': '_yaml_topology_load',
+        '.yml': '_yaml_topology_load',
+        '.json': '_json_topology_load'
+    }
+
+    # node/network fields compared in reconcile
+    _reconcile_node_keys = ('image', 'cpu', 'ram', 'ethernet', 'icon', 'left', 'top')
+    _reconcile_network_keys = ('type', 'left', 'top')
+
+    # teardown actions in run order
+    _teardown_actions = ('stop', 'wipe', 'delete_orphans', 'delete_lab')
+
+    # [start-end] name range of generate_mesh e.g. leaf[01-32]
+    _NAME_RANGE = re.compile(r'\[(\d+)-(\d+)\]')
+
+    # <lab name=".." id=".." ...> tag of eve-ng lab file (.unl), name/id are replaced on import
+    _LAB_TAG = re.compile(r'<lab\b[^>]*>')
+
+    # topology sheets with data rows, not evenger functions (not run in build)
+    _data_sheets = ('node_config',)
+
+    # eve-ng interface names of node template (ethernet count -> port names) for <Evenger.preflight>
+    # port check, nodes of other templates are not port checked (look <Evenger.register_port_names>)
+    _template_ports = {
+        'linux': lambda ethernet: [f'e{i}' for i in range(ethernet)],
+        'timoscpm': lambda ethernet: ['Mgmt', 'SF'][:ethernet],
+        'timosiom': lambda ethernet: ['SF', *(f'1/1/{i}' for i in range(1, ethernet))][:ethernet]
+    }
+
+    # ready wait (seconds from config start) of running node with config without _EXPECT prompt
+    # (readiness can not be checked on console, same as fixed boot sleep before ready check)
+    _no_prompt_ready_time = 180
+
+    # console transcript rotating file size (bytes) and backup count per node
+    _transcript_max_bytes = 10 * 1024 * 1024
+    _transcript_backup_count = 3
 
     def __post_init__(self):
+        # values may come from excel as str
+        self.pool_size = int(self.pool_size)
+        self.timeout = float(self.timeout)
+        self.retries = int(self.retries)
+        self.backoff_factor = float(self.backoff_factor)
+        self.cache_ttl = float(self.cache_ttl)
+        self.call_stats = CallStats(hook=self.call_hook)
+        self._session = self._create_session()
+        self._login_lock = threading.Lock()
         self._cookie = self._get_cookie()
-        self._node_name_id_dict = {}
-        self._nodename_interface_id_dict = {}
-        self._bridge_name_id_dict = {}
+        self._lab_caches_create()
+
+    def _lab_caches_create(self):
+        """ create empty lab specific node/bridge/interface lookup caches and node positions """
+        self._node_cache = LookupCache(
+            fetch_all=self._node_name_id_dict_fetch, ttl=self.cache_ttl)
+        self._bridge_cache = LookupCache(
+            fetch_all=self._bridge_name_id_dict_fetch, ttl=self.cache_ttl)
+        self._interface_cache = LookupCache(
+            fetch_one=self._node_interfaces_fetch, ttl=self.cache_ttl)
+        # node name: (left, top), for invisible link network position
+        self._node_positions = {}
+
+    def _lab_object(self, lab_path):
+        """ return Evenger object of other lab on same server without login (session cookie is copied),
+        connection pool, lab caches and call stats are new (self if lab_path is same)
+        """
+        if lab_path == self.lab_path:
+            return self
+        evenger_object = copy.copy(self)
+        evenger_object.lab_path = lab_path
+        evenger_object._session = self._create_session()
+        evenger_object._session.cookies.update(self._session.cookies)
+        evenger_object._login_lock = threading.Lock()
+        evenger_object.call_stats = CallStats(hook=self.call_hook)
+        evenger_object._lab_caches_create()
+        evenger_object._node_positions = dict(self._node_positions)
+        return evenger_object
+
+    def _create_session(self):
+        """ shared keep-alive session with connection pool and bounded retry
+        (5xx status retry only for idempotent methods, POST is not repeated)
+        """
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        urllib3.disable_warnings()
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.verify = False
+        return session
 
     def _get_cookie(self):
         authentication_data = {
@@ -58,94 +823,217 @@ class Evenger:
         }
         authentication_data = json.dumps(authentication_data)
         try:
-            res = requests.post(f'{self.eveng_server_url}/api/auth/login',
-                                verify=False,
-                                data=authentication_data, timeout=5)
+            start_time = time.perf_counter()
+            res = self._session.post(f'{self.eveng_server_url}/api/auth/login',
+                                     data=authentication_data,
+                                     timeout=self.timeout)
+            self.call_stats.record(
+                'POST', '/api/auth/login', res.status_code, time.perf_counter() - start_time,
+                len(authentication_data), len(res.content), operation='login')
             cookie = res.cookies
-            logging.info(res.text)
+            logger.info('Login <%s>: %s', self.eveng_server_url, res.status_code)
             return cookie
         except Exception as e:
-            logging.error(
-                f'GET COOKIE PROBLEM <{self.eveng_server_url}/api/auth/login>: {e}')
+            logger.error(
+                'GET COOKIE PROBLEM <%s/api/auth/login>: %s', self.eveng_server_url, e)
             return None
 
+    def _request(self, method, url, **kwargs):
+        """ send request with shared session, login again if cookie expired
+        (eve-ng returns 401/412 for expired or missing session, each call is timed in call_stats)
+        """
+        start_time = time.perf_counter()
+        res = None
+        try:
+            res = self._request_login_retry(method, url, **kwargs)
+            return res
+        finally:
+            self.call_stats.record(
+                method, CallStats.endpoint(url, self.lab_path),
+                'error' if res is None else res.status_code,
+                time.perf_counter() - start_time,
+                0 if res is None else len(res.request.body or b''),
+                0 if res is None else len(res.content))
+
+    def _request_login_retry(self, method, url, **kwargs):
+        res = self._session.request(
+            method, f'{self.eveng_server_url}{url}',
+            timeout=self.timeout, **kwargs)
+        if res.status_code in (401, 412):
+            # one login for concurrent callers, others reuse new cookie
+            cookie = self._cookie
+            with self._login_lock:
+                if cookie is self._cookie:
+                    logger.info(
+                        'Session expired for <%s>, login again', self.eveng_server_url)
+                    self._cookie = self._get_cookie()
+            res = self._session.request(
+                method, f'{self.eveng_server_url}{url}',
+                timeout=self.timeout, **kwargs)
+        return res
+
+    @staticmethod
+    def _response_failed(res):
+        """ True if api call failed (None: connection problem, status fail: 4xx/5xx) """
+        return res is None or (isinstance(res, dict) and res.get('status') == 'fail')
+
+    @staticmethod
+    def _log_response(res):
+        """ log response body at debug level, body is not decoded if debug is disabled """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('%s %s %s: %s', res.request.method,
+                         res.request.path_url, res.status_code, res.text)
+
     def _get(self, url):
         try:
-            res = requests.get(f'{self.eveng_server_url}{url}',
-                               cookies=self._cookie, verify=False)
-            logging.debug(res.text)
+            res = self._request('GET', url)
+            self._log_response(res)
             return res.json()
         except Exception as e:
-            logging.error(f'GET PROBLEM <{self.eveng_server_url}{url}> : {e}')
+            logger.error('GET PROBLEM <%s%s> : %s', self.eveng_server_url, url, e)
             return None
 
     def _post(self, url, json_text):
         try:
-            res = requests.post(
-                f'{self.eveng_server_url}{url}',
-                cookies=self._cookie,
-                json=json.loads(json_text),
-                verify=False)
+            res = self._request('POST', url, json=json.loads(json_text)
+                                if isinstance(json_text, str) else json_text)
             try:
-                logging.info(res.text)
+                self._log_response(res)
                 return res.json()
             except:
                 return res.text
         except Exception as e:
-            logging.error(
-                f'POST PROBLEM <{self.eveng_server_url}{url}> <{json_text}>: {e}')
+            logger.error(
+                'POST PROBLEM <%s%s> <%s>: %s', self.eveng_server_url, url, json_text, e)
             return None
 
     def _put(self, url, json_text):
         try:
-            res = requests.put(
-                f'{self.eveng_server_url}{url}',
-                cookies=self._cookie,
-                json=json.loads(json_text),
-                verify=False)
+            res = self._request('PUT', url, json=json.loads(json_text))
             try:
-                logging.info(res.text)
+                self._log_response(res)
                 return res.json()
             except:
                 return res.text
         except Exception as e:
-            logging.error(
-                f'PUT PROBLEM <{self.eveng_server_url}{url}> <{json_text}>: {e}')
+            logger.error(
+                'PUT PROBLEM <%s%s> <%s>: %s', self.eveng_server_url, url, json_text, e)
             return None
 
-    def _node_name_id_dict_create(self):
-        if self._node_name_id_dict:
-            return self._node_name_id_dict
+    def _delete(self, url):
+        try:
+            res = self._request('DELETE', url)
+            try:
+                self._log_response(res)
+                return res.json()
+            except:
+                return res.text
+        except Exception as e:
+            logger.error(
+                'DELETE PROBLEM <%s%s>: %s', self.eveng_server_url, url, e)
+            return None
+
+    def _node_name_id_dict_fetch(self):
+        # eve-ng returns empty list for lab without node
         nodes_dict = self._get(
-            f'/api/labs/{self.lab_path}.unl/nodes')['data']
-        self._node_name_id_dict = {v['name']: k for k, v in nodes_dict.items()}
-        return self._node_name_id_dict
-
-    def _nodename_interface_id_dict_create(self):
-        ''' node : {int : id, int2 : id2 }, node2 :'''
-        if self._nodename_interface_id_dict:
-            return self._nodename_interface_id_dict
-        result_dict = {}
-        for node_name, node_id in self._node_name_id_dict_create().items():
-            node_int_list = self._get(
-                f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces')['data']['ethernet']
-            result_dict[node_name] = {v['name']: str(
-                i) for i, v in enumerate(node_int_list)}
-        self._nodename_interface_id_dict = result_dict
-        return self._nodename_interface_id_dict
+            f'/api/labs/{self.lab_path}.unl/nodes')['data'] or {}
+        for v in nodes_dict.values():
+            self._node_position_set(v['name'], v.get('left'), v.get('top'))
+        return {v['name']: k for k, v in nodes_dict.items()}
 
-    def _bridge_name_id_dict_create(self):
-        if self._bridge_name_id_dict:
-            return self._bridge_name_id_dict
+    def _node_name_id_dict_create(self):
+        return self._node_cache.get_all()
+
+    def _node_added(self, node_name, node_id, left=None, top=None):
+        ''' write new node id to node cache '''
+        if node_name:
+            self._node_cache.set(node_name, str(node_id))
+            self._interface_cache.invalidate(node_name)
+            self._node_position_set(node_name, left, top)
+
+    def _node_position_set(self, node_name, left, top):
+        try:
+            self._node_positions[node_name] = (int(float(left)), int(float(top)))
+        except (TypeError, ValueError):
+            pass
+
+    def _link_position(self, first_node, second_node):
+        ''' (left, top) of node to node link network, midpoint of nodes or 500, 500 if not known '''
+        first = self._node_positions.get(first_node)
+        second = self._node_positions.get(second_node)
+        if first is None or second is None:
+            return '500', '500'
+        return str((first[0] + second[0]) // 2), str((first[1] + second[1]) // 2)
+
+    def _node_interfaces_fetch(self, node_name):
+        ''' fetch one node interfaces, {int : id, int2 : id2 } '''
+        node_id = self._node_cache.get(node_name)
+        node_int_list = self._get(
+            f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces')['data']['ethernet']
+        return {v['name']: str(i) for i, v in enumerate(node_int_list)}
+
+    def _node_interface_id(self, node_name, node_port):
+        ''' interface id of node port, node interfaces fetched on first use '''
+        return self._interface_cache.get(node_name)[node_port]
+
+    def _nodename_interface_id_dict_create(self, node_names=None):
+        ''' node : {int : id, int2 : id2 }, node2 :
+        (only not cached nodes fetched concurrently, all nodes if node_names not set)
+        '''
+        node_name_id_dict = self._node_name_id_dict_create()
+        if node_names is None:
+            node_names = node_name_id_dict
+        cached_dict = self._interface_cache.get_all()
+        missing_nodes = [
+            i for i in node_names if i in node_name_id_dict and i not in cached_dict
+        ]
+        if missing_nodes:
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                list(executor.map(
+                    self.call_stats.bind(self._interface_cache.get), missing_nodes))
+        return self._interface_cache.get_all()
+
+    def _bridge_name_id_dict_fetch(self):
         bridge_dict = self._get(
-            f'/api/labs/{self.lab_path}.unl/networks')['data']
-        self._bridge_name_id_dict = {
+            f'/api/labs/{self.lab_path}.unl/networks')['data'] or {}
+        return {
             v['name']: k for k, v in bridge_dict.items() if str(v['visibility']) == '1'}
-        return self._bridge_name_id_dict
+
+    def _bridge_name_id_dict_create(self):
+        return self._bridge_cache.get_all()
+
+    def invalidate_cache(self, entity=None, name=None):
+        """ invalidate node/bridge/interface lookup cache, entries are fetched again on next use
+
+        ### Args:
+            - entity (optional) : node, bridge or interface (all caches if not set)
+            - name (optional) : node or bridge name (all entries if not set)
+
+        """
+        caches = {
+            'node': self._node_cache,
+            'bridge': self._bridge_cache,
+            'interface': self._interface_cache
+        }
+        if entity is None:
+            for cache in caches.values():
+                cache.invalidate(name)
+        else:
+            caches[entity].invalidate(name)
+        if entity == 'node' and name:
+            self._interface_cache.invalidate(name)
 
     @staticmethod
     def _send_telnet_commands(commands_text, node_ip, node_port):
         """ Send telnet commands with _EXCEPT and _SLEEP options
+        (look <Evenger._send_telnet_commands_async>)
+        """
+        return asyncio.run(Evenger._send_telnet_commands_async(
+            commands_text, node_ip, node_port))
+
+    @staticmethod
+    async def _send_telnet_commands_async(commands_text, node_ip, node_port, console=None):
+        """ Send telnet commands with _EXCEPT and _SLEEP options (asyncio)
 
         Example commands_text:
 
@@ -160,6 +1048,8 @@ class Evenger:
             configure
         '''
         ```
+
+        Already opened TelnetConsole can be given with console.
         """
         commands_line = [i.strip()
                          for i in commands_text.splitlines() if i.strip() != '']
@@ -167,62 +1057,101 @@ class Evenger:
             except_line = ''
             timeout_line = 5
             temp_sleep = 0
-            outputs = ''
-            with telnetlib.Telnet(node_ip, int(node_port)) as tn:
-                for i in commands_line:
-                    if i.startswith('_EXPECT:'):
-                        except_line = i.removeprefix('_EXPECT:').strip()
-                        continue
-                    if i.startswith('_TIMEOUT:'):
-                        timeout_line = int(i.removeprefix('_TIMEOUT:').strip())
-                        continue
-                    if i.startswith('_SLEEP:'):
-                        temp_sleep = int(i.removeprefix('_SLEEP:').strip())
-                        time.sleep(temp_sleep)
-                        continue
-                    if except_line:
-                        output = tn.read_until(
-                            except_line.encode(), timeout=timeout_line)
-                        outputs += str(output, encoding='ascii')
-                        tn.write(i.encode('ascii')+b'\n')
-                        outputs += str(tn.read_eager(), encoding='ascii')
-                    else:
-                        tn.write(i.encode('ascii')+b'\n')
-                        outputs += str(tn.read_eager(), encoding='ascii')
-            return outputs
+            if console is None:
+                console = await TelnetConsole.open(node_ip, node_port)
+            for i in commands_line:
+                if i.startswith('_EXPECT:'):
+                    except_line = i.removeprefix('_EXPECT:').strip()
+                    continue
+                if i.startswith('_TIMEOUT:'):
+                    timeout_line = int(i.removeprefix('_TIMEOUT:').strip())
+                    continue
+                if i.startswith('_SLEEP:'):
+                    temp_sleep = int(i.removeprefix('_SLEEP:').strip())
+                    await asyncio.sleep(temp_sleep)
+                    continue
+                if except_line:
+                    await console.read_until(
+                        except_line.encode(), timeout=timeout_line)
+                await console.write(i)
+            return console.transcript()
         except Exception as e:
-            logging.error(f'Telnet problem {node_ip} {node_port} : {e}')
+            logger.error('Telnet problem %s %s : %s', node_ip, node_port, e)
             return None
+        finally:
+            if console:
+                await console.close()
+
+    @_timed_operation('add_node')
+    def _add_node(self, payload):
+        ''' post node payload dict to lab, return node id '''
+        res = self._post(f'/api/labs/{self.lab_path}.unl/nodes', payload)
+        node_id = res['data']['id']
+        self._node_added(payload.get('name'), node_id,
+                         payload.get('left'), payload.get('top'))
+        return node_id
+
+    @classmethod
+    def register_node_template(cls, node_type, template):
+        """ register node type for <Evenger.add_node>
 
-    def add_lab(self, **lab_args):
-        """ Add new lab (check path-name not exist on eveng)
+        ### Args:
+            - node_type : xrv
+            - template : eve-ng node json data text (Jinja template) or dict with {{arg}} values
+
+        """
+        cls._templates[node_type] = NodeTemplate(template)
+
+    @classmethod
+    def register_port_names(cls, template, port_names):
+        """ register eve-ng interface names of node template for <Evenger.preflight> port check
 
         ### Args:
-            - description (optional) : lab description
+            - template : vios (eve-ng template name, "template" of node json data)
+            - port_names : function(ethernet count) returns port names e.g.
+              lambda ethernet: [f'Gi0/{i}' for i in range(ethernet)]
+
+        """
+        cls._template_ports[template] = port_names
+
+    def add_node(self, node_type, **node_args):
+        """Add node with registered node type template (look <Evenger.register_node_template>)
+
+        ### Args:
+            - node_type : sros_cpm, sros_iom, linux or registered node type
+            - other args depend on node type template
+
+        ### Returns:
+            - node id (str) : 1
 
         """
-        path_name_list = self.lab_path.rsplit('/', maxsplit=1)
+        node_id = self._add_node(
+            self._templates[node_type].payload(node_args))
+        logger.info('add_node %s %s done!', node_type, node_args.get('name'))
+        logger.debug('add_node %s args: %s', node_type, node_args)
+        return node_id
+
+    @staticmethod
+    def _lab_name_path(lab_path):
+        """ return (name, folder path) of lab_path e.g. ('lab_1', '/students') of students/lab_1 """
+        path_name_list = lab_path.rsplit('/', maxsplit=1)
         if len(path_name_list) == 1:
-            lab_args['name'] = path_name_list[0]
-            lab_args['path'] = '/'
-        else:
-            lab_args['name'] = path_name_list[1]
-            lab_args['path'] = '/' + path_name_list[0]
+            return path_name_list[0], '/'
+        return path_name_list[1], '/' + path_name_list[0]
 
-        json_text = '''
-        {
-        "author": "",
-        "description": "{{description}}",
-        "scripttimeout": 300,
-        "version": 1,
-        "name": "{{name}}",
-        "body": "",
-        "path": "{{path}}"
-        }
-        '''
+    @_timed_operation('add_lab')
+    def add_lab(self, **lab_args):
+        """ Add new lab (check path-name not exist on eveng)
+
+        ### Args:
+            - description (optional) : lab description
 
-        self._post(f'/api/labs', Template(json_text).render(lab_args))
-        logging.info(f'add_lab {lab_args} done!')
+        """
+        lab_args['name'], lab_args['path'] = self._lab_name_path(self.lab_path)
+        res = self._post(f'/api/labs', self._templates['lab'].payload(lab_args))
+        if self._response_failed(res):
+            raise ValueError(f'lab <{self.lab_path}> not added: {res}')
+        logger.info('add_lab %s done!', lab_args)
 
     def add_node_custom(self, **node_args):
         """Add node custom with custom_json_text (Jinja template) to lab
@@ -235,10 +1164,11 @@ class Evenger:
             - node id (str) : 1
 
         """
-        res = self._post(f'/api/labs/{self.lab_path}.unl/nodes',
-                         Template(node_args['custom_json_text']).render(node_args))
-        logging.info(f'add_node_custom {node_args} done!')
-        return res['data']['id']
+        node_id = self._add_node(NodeTemplate.cached(
+            node_args['custom_json_text']).payload(node_args))
+        logger.info('add_node_custom %s done!', node_args.get('name'))
+        logger.debug('add_node_custom args: %s', node_args)
+        return node_id
 
     def add_node_sros_cpm(self, **node_args):
         """Add node sros-cpm to lab
@@ -256,38 +1186,11 @@ class Evenger:
             - node id (str) : 1
 
         """
-        json_text = '''
-        {
-        "template":"timoscpm",
-        "type":"qemu",
-        "count":"1",
-        "image":"{{image}}",
-        "name":"{{name}}",
-        "icon":"SROS.png",
-        "uuid":"",
-        "cpulimit":"undefined",
-        "cpu":"1",
-        "ram":"2048",
-        "ethernet":"2",
-        "management_address":"{{management_address}}",
-        "timos_line":"{{timos_line}}",
-        "timos_license":"{{timos_license}}",
-        "qemu_version":"","qemu_arch":"",
-        "qemu_nic":"",
-        "qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
-        "ro_qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
-        "config":"0",
-        "delay":"0",
-        "console":"telnet",
-        "left":"{{left}}",
-        "top":"{{top}}",
-        "postfix":0
-        }
-        '''
-        res = self._post(f'/api/labs/{self.lab_path}.unl/nodes',
-                         Template(json_text).render(node_args))
-        logging.info(f'add_node_sros_cpm {node_args} done!')
-        return res['data']['id']
+        node_id = self._add_node(
+            self._templates['sros_cpm'].payload(node_args))
+        logger.info('add_node_sros_cpm %s done!', node_args.get('name'))
+        logger.debug('add_node_sros_cpm args: %s', node_args)
+        return node_id
 
     def add_node_sros_iom(self, **node_args):
         """Add node sros-iom to lab
@@ -304,37 +1207,11 @@ class Evenger:
 
         """
 
-        json_text = '''
-        {
-        "template":"timosiom",
-        "type":"qemu",
-        "count":"1",
-        "image":"{{image}}",
-        "name":"{{name}}",
-        "icon":"SROS linecard.png",
-        "uuid":"",
-        "cpulimit":"undefined",
-        "cpu":"1",
-        "ram":"2048",
-        "ethernet":"10",
-        "timos_line":"{{timos_line}}",
-        "qemu_version":"",
-        "qemu_arch":"",
-        "qemu_nic":"",
-        "qemu_options": "-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
-        "ro_qemu_options":"-machine type=pc,accel=kvm -serial mon:stdio -nographic -no-user-config -nodefaults -rtc base=utc",
-        "config":"0",
-        "delay":"0",
-        "console":"telnet",
-        "left":"{{left}}",
-        "top":"{{top}}",
-        "postfix":0
-        }
-        '''
-        res = self._post(f'/api/labs/{self.lab_path}.unl/nodes',
-                         Template(json_text).render(node_args))
-        logging.info(f'add_node_sros_iom {node_args} done!')
-        return res['data']['id']
+        node_id = self._add_node(
+            self._templates['sros_iom'].payload(node_args))
+        logger.info('add_node_sros_iom %s done!', node_args.get('name'))
+        logger.debug('add_node_sros_iom args: %s', node_args)
+        return node_id
 
     def add_node_linux(self, **node_args):
         """Add node linux server to lab
@@ -351,38 +1228,13 @@ class Evenger:
             - node id (str) : 1
 
         """
-        json_text = '''
-        {
-        "template": "linux",
-        "type": "qemu",
-        "count": "1",
-        "image": "{{image}}",
-        "name": "{{name}}",
-        "icon": "Server.png",
-        "uuid": "",
-        "cpulimit": "undefined",
-        "cpu": "{{cpu}}",
-        "ram": "{{ram}}",
-        "ethernet": "2",
-        "firstmac": "",
-        "qemu_version": "",
-        "qemu_arch": "",
-        "qemu_nic": "",
-        "qemu_options": "-machine type=pc,accel=kvm -vga virtio -usbdevice tablet -boot order=cd",
-        "ro_qemu_options": "-machine type=pc,accel=kvm -vga virtio -usbdevice tablet -boot order=cd",
-        "config": "0",
-        "delay": "0",
-        "console": "vnc",
-        "left": "{{left}}",
-        "top": "{{top}}",
-        "postfix": 0
-        }
-        '''
-        res = self._post(f'/api/labs/{self.lab_path}.unl/nodes',
-                         Template(json_text).render(node_args))
-        logging.info(f'add_node_linux {node_args} done!')
-        return res['data']['id']
+        node_id = self._add_node(
+            self._templates['linux'].payload(node_args))
+        logger.info('add_node_linux %s done!', node_args.get('name'))
+        logger.debug('add_node_linux args: %s', node_args)
+        return node_id
 
+    @_timed_operation('add_network')
     def add_network(self, **network_args):
         """Add network (bridge) to lab
 
@@ -391,28 +1243,23 @@ class Evenger:
             - type : bridge or pnet0
             - left (str) : 200
             - top (str) : 200
+            - visibility (optional) : 1 (0 for invisible node to node link network)
 
         ### Returns:
             - network/bridge id (str) : 1
 
         """
-        json_text = '''
-        {
-        "count": "1",
-        "visibility": "1",
-        "name": "{{name}}",
-        "type": "{{type}}",
-        "left": "{{left}}",
-        "top": "{{top}}",
-        "postfix": 0
-        }
-        '''
 
         res = self._post(f'/api/labs/{self.lab_path}.unl/networks',
-                         Template(json_text).render(network_args))
-        logging.info(f'add_network {network_args} done!')
-        return res['data']['id']
-
+                         self._templates['network'].payload({'visibility': '1', **network_args}))
+        network_id = res['data']['id']
+        if str(network_args.get('visibility', '1')) == '1':
+            self._bridge_cache.set(network_args.get('name'), str(network_id))
+        logger.info('add_network %s done!', network_args.get('name'))
+        logger.debug('add_network args: %s', network_args)
+        return network_id
+
+    @_timed_operation('connect')
     def connect_node_to_bridge(self, node_name, node_port, bridge_name):
         """create connection between node and bridge
         (!!! before create connection, all bridge and node should be already created !!!)
@@ -424,15 +1271,17 @@ class Evenger:
 
         """
 
-        node_id = self._node_name_id_dict_create()[node_name]
-        network_id = self._bridge_name_id_dict_create()[bridge_name]
-        int_id = self._nodename_interface_id_dict_create()[
-            node_name][node_port]
-        self._put(f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces',
-                  f'{{"{int_id}":{network_id}}}')
-        logging.info(
-            f'connect_node_to_bridge {node_name}, {node_port}, {bridge_name} done!')
-
+        node_id = self._node_cache.get(node_name)
+        network_id = self._bridge_cache.get(bridge_name)
+        int_id = self._node_interface_id(node_name, node_port)
+        res = self._put(f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces',
+                        f'{{"{int_id}":{network_id}}}')
+        if self._response_failed(res):
+            raise ValueError(f'node <{node_name}> interfaces not updated: {res}')
+        logger.info(
+            'connect_node_to_bridge %s, %s, %s done!', node_name, node_port, bridge_name)
+
+    @_timed_operation('connect')
     def connect_node_to_node(self, first_node, first_port, second_node, second_port):
         """create connection between nodes
         (!!! before create connection, all bridge and node should be already created !!!)
@@ -444,32 +1293,1068 @@ class Evenger:
             - second_port : SF or 1/1/1
 
         """
+        left, top = self._link_position(first_node, second_node)
         network_dict_invisible = {
             'name': 'Bridge_invisible',
             'type': 'bridge',
-            'left': '500',
-            'top': '500'
+            'left': left,
+            'top': top
         }
 
         network_id = self.add_network(**network_dict_invisible)
-        first_node_id = self._node_name_id_dict_create()[first_node]
-        second_node_id = self._node_name_id_dict_create()[second_node]
-        first_int_id = self._nodename_interface_id_dict_create()[
-            first_node][first_port]
-        second_int_id = self._nodename_interface_id_dict_create()[
-            second_node][second_port]
-
-        self._put(f'/api/labs/{self.lab_path}.unl/nodes/{first_node_id}/interfaces',
-                  f'{{"{first_int_id}":{network_id}}}')
-        self._put(f'/api/labs/{self.lab_path}.unl/nodes/{second_node_id}/interfaces',
-                  f'{{"{second_int_id}":{network_id}}}')
-
-        self._put(f'/api/labs/{self.lab_path}.unl/networks/{network_id}',
-                  '{"visibility":"0"}')
-        logging.info(
-            f'connect_node_to_node {first_node}, {first_port}, {second_node}, {second_port} done!')
-
-    def config_with_telnet(self, config_folder='configs', log_debug=False):
+        first_node_id = self._node_cache.get(first_node)
+        second_node_id = self._node_cache.get(second_node)
+        first_int_id = self._node_interface_id(first_node, first_port)
+        second_int_id = self._node_interface_id(second_node, second_port)
+
+        for node_name, node_id, int_id in ((first_node, first_node_id, first_int_id),
+                                           (second_node, second_node_id, second_int_id)):
+            res = self._put(f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces',
+                            f'{{"{int_id}":{network_id}}}')
+            if self._response_failed(res):
+                raise ValueError(f'node <{node_name}> interfaces not updated: {res}')
+
+        res = self._put(f'/api/labs/{self.lab_path}.unl/networks/{network_id}',
+                        '{"visibility":"0"}')
+        if self._response_failed(res):
+            raise ValueError(f'network <{network_id}> visibility not updated: {res}')
+        # invisible network is not bridge for connect_node_to_bridge
+        self._bridge_cache.invalidate(
+            network_dict_invisible['name'], str(network_id))
+        logger.info(
+            'connect_node_to_node %s, %s, %s, %s done!',
+            first_node, first_port, second_node, second_port)
+
+    @_timed_operation('connect')
+    def connect_links(self, links, workers=None):
+        """create many connections with one interface update per node
+        (!!! before create connection, all bridge and node should be already created !!!)
+
+        Node to node link networks are created invisible concurrently, after that
+        all interfaces of a node are connected with one PUT.
+
+        ### Args:
+            - links : list of connect_node_to_node or connect_node_to_bridge args e.g.
+              [{'first_node': '7750_test_1', 'first_port': '1/1/1', 'second_node': '7750_test_2', 'second_port': '1/1/1'},
+              {'node_name': '7750_test_1', 'node_port': 'Mgmt', 'bridge_name': 'Bridge_internal'}]
+            - workers (optional) : parallel api calls (default: pool_size)
+
+        ### Returns:
+            - link results in links order e.g. [{'link': {...}, 'network_id': '5', 'error': ''}, ...]
+
+        """
+        workers = int(workers or self.pool_size)
+        results = [
+            {'link': link, 'network_id': None, 'error': ''} for link in links
+        ]
+
+        # node/interface ids, interfaces of all link nodes fetched concurrently
+        try:
+            self._nodename_interface_id_dict_create({
+                v for link in links for k, v in link.items()
+                if k in ('node_name', 'first_node', 'second_node')
+            })
+        except Exception as e:
+            logger.error('connect_links interface ids failed: %s', e)
+        link_ports = {}
+        used_ports = set()
+        for index, link in enumerate(links):
+            try:
+                if 'bridge_name' in link:
+                    ports = [(link['node_name'], link['node_port'])]
+                    results[index]['network_id'] = self._bridge_cache.get(
+                        link['bridge_name'])
+                else:
+                    ports = [(link['first_node'], link['first_port']),
+                             (link['second_node'], link['second_port'])]
+                node_int_ids = []
+                for node_name, node_port in ports:
+                    if (node_name, node_port) in used_ports:
+                        raise ValueError(
+                            f'{node_name} {node_port} used in more than one link')
+                    node_int_ids.append((
+                        self._node_cache.get(node_name),
+                        self._node_interface_id(node_name, node_port)))
+                used_ports.update(ports)
+                link_ports[index] = node_int_ids
+            except Exception as e:
+                results[index]['error'] = str(e)
+
+        def add_link_network(index):
+            try:
+                left, top = self._link_position(
+                    links[index]['first_node'], links[index]['second_node'])
+                results[index]['network_id'] = str(self.add_network(
+                    name='Bridge_invisible', type='bridge',
+                    left=left, top=top, visibility='0'))
+            except Exception as e:
+                results[index]['error'] = f'link network not created: {e}'
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.call_stats.bind(add_link_network), [
+                i for i in link_ports if 'bridge_name' not in links[i]
+            ]))
+
+        # group interface assignments per node
+        node_interfaces = {}
+        node_link_indexes = {}
+        for index, node_int_ids in link_ports.items():
+            if results[index]['error']:
+                continue
+            for node_id, int_id in node_int_ids:
+                node_interfaces.setdefault(node_id, {})[int_id] = int(
+                    results[index]['network_id'])
+                node_link_indexes.setdefault(node_id, []).append(index)
+
+        def put_node_interfaces(node_id):
+            res = self._put(f'/api/labs/{self.lab_path}.unl/nodes/{node_id}/interfaces',
+                            json.dumps(node_interfaces[node_id]))
+            if self._response_failed(res):
+                for index in node_link_indexes[node_id]:
+                    results[index]['error'] = f'node id <{node_id}> interfaces not updated: {res}'
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                self.call_stats.bind(put_node_interfaces), node_interfaces))
+
+        for result in results:
+            if result['error']:
+                logger.error(
+                    'connect_links %s failed: %s', result["link"], result["error"])
+        logger.info(
+            'connect_links %s/%s done!', sum(1 for i in results if not i["error"]), len(results))
+        return results
+
+    @staticmethod
+    def _expand_names(names):
+        """ expand comma separated names with [start-end] ranges e.g. 'leaf[01-03],border' ->
+        ['leaf01', 'leaf02', 'leaf03', 'border']
+        """
+        if isinstance(names, (list, tuple)):
+            return list(names)
+        expanded = []
+        for name in [i.strip() for i in str(names).split(',') if i.strip()]:
+            match = Evenger._NAME_RANGE.search(name)
+            if not match:
+                expanded.append(name)
+                continue
+            start, end = match.group(1), match.group(2)
+            width = len(start) if start.startswith('0') else 0
+            expanded.extend(
+                f'{name[:match.start()]}{str(i).zfill(width)}{name[match.end():]}'
+                for i in range(int(start), int(end) + 1))
+        return expanded
+
+    @staticmethod
+    def mesh_rows(mesh, nodes='', spines='', leafs='', port_pattern='e{index}', leaf_port_pattern='',
+                  port_start=1, links_per_pair=1, node_function='', bridge_name='', bridge_port='', **node_args):
+        """ expand link mesh to evenger rows (node rows, then connection rows)
+
+        ### Args:
+            - mesh : full_mesh, ring or spine_leaf
+            - nodes : node names for full_mesh/ring e.g. r[1-8] or r1,r2,r3
+            - spines, leafs : node names for spine_leaf e.g. spine[1-4], leaf[01-32]
+            - port_pattern (optional) : e{index} ({index}: link counter per node from port_start, {peer}: peer node name)
+            - leaf_port_pattern (optional) : leaf side port pattern of spine_leaf (default port_pattern)
+            - port_start (optional) : 1 (first {index} of each node)
+            - links_per_pair (optional) : 1 (parallel links between each node pair)
+            - node_function (optional) : add_node_linux (nodes are also created with this evenger function
+              and other args e.g. image, cpu, ram)
+            - bridge_name, bridge_port (optional) : Bridge_mgmt, e0 (each node bridge_port connected to bridge_name)
+
+        ### Returns:
+            - [(evenger function name, header list, value list), ...] e.g. for Topology.sheet_rows
+
+        """
+        port_start = int(port_start)
+        links_per_pair = int(links_per_pair)
+        leaf_port_pattern = leaf_port_pattern or port_pattern
+        if mesh == 'spine_leaf':
+            first_nodes = Evenger._expand_names(spines)
+            second_nodes = Evenger._expand_names(leafs)
+            pairs = [(i, j) for j in second_nodes for i in first_nodes]
+            all_nodes = first_nodes + second_nodes
+        elif mesh in ('full_mesh', 'ring'):
+            all_nodes = Evenger._expand_names(nodes)
+            if mesh == 'full_mesh':
+                pairs = [
+                    (i, j) for index, i in enumerate(all_nodes) for j in all_nodes[index + 1:]]
+            else:
+                pairs = list(zip(all_nodes, all_nodes[1:]))
+                if len(all_nodes) > 2:
+                    pairs.append((all_nodes[-1], all_nodes[0]))
+        else:
+            raise ValueError(f'mesh <{mesh}> must be full_mesh, ring or spine_leaf')
+
+        rows = []
+        if node_function:
+            node_header = ['name'] + list(node_args)
+            rows.extend(
+                (node_function, node_header, [name] + [str(i) for i in node_args.values()])
+                for name in all_nodes)
+        if bridge_name:
+            rows.extend(
+                ('connect_node_to_bridge', ['node_name', 'node_port', 'bridge_name'],
+                 [name, bridge_port, bridge_name])
+                for name in all_nodes)
+
+        link_header = ['first_node', 'first_port', 'second_node', 'second_port']
+        port_index = {}
+        second_pattern = leaf_port_pattern if mesh == 'spine_leaf' else port_pattern
+        for first, second in pairs:
+            for _ in range(links_per_pair):
+                first_index = port_index.get(first, port_start)
+                second_index = port_index.get(second, port_start)
+                port_index[first] = first_index + 1
+                port_index[second] = second_index + 1
+                rows.append(('connect_node_to_node', link_header, [
+                    first, port_pattern.format(index=first_index, peer=second),
+                    second, second_pattern.format(index=second_index, peer=first)]))
+        return rows
+
+    def generate_mesh(self, workers=None, layout='', **mesh_args):
+        """ create link mesh (and nodes if node_function) with bulk build (look <Evenger.mesh_rows> for args)
+        (!!! without node_function, all nodes should be already created !!!)
+
+        ### Args:
+            - workers (optional) : parallel api calls (default: pool_size)
+            - layout (optional) : grid, layered or force (left/top of generated nodes, look <Evenger.layout_rows>)
+            - mesh_args : mesh, nodes, spines, leafs, port_pattern ... e.g.
+              mesh='spine_leaf', spines='spine[1-2]', leafs='leaf[1-8]', port_pattern='e{index}'
+
+        ### Returns:
+            - generated rows count (int)
+
+        """
+        rows = self.mesh_rows(**mesh_args)
+        if layout:
+            rows = self.layout_rows(rows, layout)
+        Evenger._excel_rows_run(self, rows, workers=max(int(workers or self.pool_size), 2))
+        logger.info('generate_mesh %s: %s rows done!', mesh_args.get('mesh'), len(rows))
+        return len(rows)
+
+    @_timed_operation('get_lab_state')
+    def get_lab_state(self, workers=None):
+        """ fetch current lab nodes, networks and interface bindings once
+
+        ### Args:
+            - workers (optional) : parallel node interface calls (default: pool_size)
+
+        ### Returns:
+            - {'nodes': {node_id: node_dict}, 'networks': {network_id: network_dict},
+              'interfaces': {node_id: [{'name': 'e0', 'network_id': 3}, ...]}}
+
+        """
+        lab_url = f'/api/labs/{self.lab_path}.unl'
+        # eve-ng returns empty list for lab without node/network
+        nodes = self._get(f'{lab_url}/nodes')['data'] or {}
+        networks = self._get(f'{lab_url}/networks')['data'] or {}
+
+        def node_interfaces(node_id):
+            return node_id, self._get(
+                f'{lab_url}/nodes/{node_id}/interfaces')['data']['ethernet']
+
+        with ThreadPoolExecutor(max_workers=int(workers or self.pool_size)) as executor:
+            interfaces = dict(executor.map(
+                self.call_stats.bind(node_interfaces), nodes))
+        return {'nodes': nodes, 'networks': networks, 'interfaces': interfaces}
+
+    def _template_options(self, template):
+        ''' eve-ng template options e.g. {'image': {'list': {...}}, 'ethernet': {...}, ...}, None if not received '''
+        res = self._get(f'/api/list/templates/{template}') or {}
+        try:
+            return res['data']['options']
+        except (KeyError, TypeError):
+            return None
+
+    def _preflight_snapshot(self, templates, workers, lab_nodes=True):
+        """ server templates with images and current lab nodes/bridges, fetched once for preflight
+        (template is None if not on server or template info not received)
+        """
+        lab_url = f'/api/labs/{self.lab_path}.unl'
+        server_templates = (self._get('/api/list/templates/') or {}).get('data') or {}
+
+        def template_images(template):
+            if template not in server_templates:
+                return template, None
+            try:
+                # eve-ng returns empty list for template without image
+                return template, set(self._template_options(template)['image']['list'] or ())
+            except (KeyError, TypeError):
+                return template, None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            images = dict(executor.map(
+                self.call_stats.bind(template_images), templates))
+        nodes = {}
+        networks = {}
+        if lab_nodes:
+            # lab may not exist yet (code 404 without data)
+            nodes = (self._get(f'{lab_url}/nodes') or {}).get('data') or {}
+            networks = (self._get(f'{lab_url}/networks') or {}).get('data') or {}
+        return {
+            'templates': server_templates,
+            'images': images,
+            'nodes': {v['name']: v for v in nodes.values()},
+            'bridges': {v['name'] for v in networks.values() if str(v.get('visibility')) == '1'}
+        }
+
+    @_timed_operation('preflight')
+    def preflight(self, sheet_rows, workers=None, lab_nodes=True):
+        """ check topology rows before any write, with one snapshot of server templates/images and lab
+        (node template and image exist on server, node names are unique, link nodes and bridges exist
+        in rows or lab, link ports exist for node template and are used once)
+
+        ### Args:
+            - sheet_rows : [(evenger function name, header list, value list), ...] e.g. Topology.sheet_rows
+            - workers (optional) : parallel template calls (default: pool_size)
+            - lab_nodes (optional) : True (nodes/bridges of existing lab are valid link ends,
+              False for new lab, lab is not fetched)
+
+        ### Returns:
+            - all problems (list of str), empty list if topology can be built
+
+        """
+        problems = []
+        nodes = {}
+        bridges = set()
+        link_rows = []
+        for sheet, header, v_strip in sheet_rows:
+            row_args = {i: j for i, j in zip(header, v_strip) if j != ''}
+            if sheet.startswith('add_node'):
+                try:
+                    payload = self._node_row_payload(sheet, row_args)
+                except Exception as e:
+                    problems.append(f'Sheet <{sheet}> line <{v_strip}>: node not valid: {e!r}')
+                    continue
+                if payload.get('name') in nodes:
+                    problems.append(
+                        f'Sheet <{sheet}> line <{v_strip}>: node name <{payload.get("name")}> is not unique')
+                    continue
+                nodes[payload.get('name')] = (sheet, v_strip, payload)
+            elif sheet == 'add_network' and str(row_args.get('visibility', '1')) == '1':
+                bridges.add(row_args.get('name'))
+            elif sheet in ('connect_node_to_node', 'connect_node_to_bridge'):
+                link_rows.append((sheet, v_strip, row_args))
+
+        snapshot = self._preflight_snapshot(
+            {i[2].get('template') for i in nodes.values()}, int(workers or self.pool_size), lab_nodes)
+        for sheet, v_strip, payload in nodes.values():
+            template = payload.get('template')
+            images = snapshot['images'].get(template)
+            if template not in snapshot['templates']:
+                problems.append(f'Sheet <{sheet}> line <{v_strip}>: template <{template}> not on server')
+            elif images is None:
+                problems.append(f'Sheet <{sheet}> line <{v_strip}>: template <{template}> info not received')
+            elif payload.get('image') not in images:
+                problems.append(
+                    f'Sheet <{sheet}> line <{v_strip}>: image <{payload.get("image")}> not on server '
+                    f'for template <{template}> (images: {sorted(images)})')
+
+        # port names of rows nodes and lab nodes, None if template port names are not known
+        node_ports = {
+            name: node for name, node in snapshot['nodes'].items() if name not in nodes}
+        node_ports.update({name: i[2] for name, i in nodes.items()})
+        for name, node in node_ports.items():
+            port_names = self._template_ports.get(node.get('template'))
+            node_ports[name] = set(port_names(int(node.get('ethernet') or 0))) if port_names else None
+        bridges |= snapshot['bridges']
+
+        used_ports = set()
+        for sheet, v_strip, row_args in link_rows:
+            if sheet == 'connect_node_to_bridge':
+                ports = [(row_args.get('node_name'), row_args.get('node_port'))]
+                if row_args.get('bridge_name') not in bridges:
+                    problems.append(
+                        f'Sheet <{sheet}> line <{v_strip}>: bridge <{row_args.get("bridge_name")}> not found')
+            else:
+                ports = [(row_args.get('first_node'), row_args.get('first_port')),
+                         (row_args.get('second_node'), row_args.get('second_port'))]
+            for node_name, node_port in ports:
+                if node_name not in node_ports:
+                    problems.append(f'Sheet <{sheet}> line <{v_strip}>: node <{node_name}> not found')
+                elif node_ports[node_name] is not None and node_port not in node_ports[node_name]:
+                    problems.append(
+                        f'Sheet <{sheet}> line <{v_strip}>: port <{node_port}> not found on node <{node_name}> '
+                        f'(ports: {sorted(node_ports[node_name])})')
+                elif (node_name, node_port) in used_ports:
+                    problems.append(
+                        f'Sheet <{sheet}> line <{v_strip}>: port <{node_port}> of node <{node_name}> already used')
+                used_ports.add((node_name, node_port))
+
+        logger.info('Preflight %s: %s nodes, %s links, %s problems',
+                    self.lab_path, len(nodes), len(link_rows), len(problems))
+        return problems
+
+    def _node_row_payload(self, sheet, node_args):
+        """ node payload of add_node* sheet row """
+        if sheet == 'add_node_custom':
+            return NodeTemplate.cached(node_args['custom_json_text']).payload(node_args)
+        if sheet == 'add_node':
+            return self._templates[node_args['node_type']].payload(node_args)
+        return self._templates[sheet.removeprefix('add_node_')].payload(node_args)
+
+    def reconcile(self, sheet_rows, workers=None, apply=True):
+        """ diff lab with topology rows and apply only needed creates, updates and deletes
+        (lab state is fetched once with <Evenger.get_lab_state>, nodes/networks not in rows,
+        duplicate nodes/bridges and invisible link networks without port are deleted)
+
+        ### Args:
+            - sheet_rows : [(evenger function name, header list, value list), ...] e.g. Topology.sheet_rows
+            - workers (optional) : parallel api calls (default: pool_size)
+            - apply (optional) : True (False returns plan only)
+
+        ### Returns:
+            - plan dict with keys: create_nodes, update_nodes, delete_nodes, create_networks,
+              update_networks, delete_networks, create_links, detach_ports
+
+        """
+        workers = int(workers or self.pool_size)
+        lab_url = f'/api/labs/{self.lab_path}.unl'
+        state = self.get_lab_state(workers)
+        plan = {i: [] for i in (
+            'create_nodes', 'update_nodes', 'delete_nodes', 'create_networks',
+            'update_networks', 'delete_networks', 'create_links', 'detach_ports')}
+
+        # current nodes and bridges by name, duplicates from partial builds are deleted
+        node_ids = {}
+        for node_id, node in sorted(state['nodes'].items(), key=lambda i: int(i[0])):
+            if node['name'] in node_ids:
+                plan['delete_nodes'].append(node_id)
+            else:
+                node_ids[node['name']] = node_id
+        bridge_ids = {}
+        for network_id, network in sorted(state['networks'].items(), key=lambda i: int(i[0])):
+            if str(network.get('visibility')) != '1':
+                continue
+            if network['name'] in bridge_ids:
+                plan['delete_networks'].append(network_id)
+            else:
+                bridge_ids[network['name']] = network_id
+
+        # current interface bindings {(node_name, port): network_id}
+        node_names = {v: k for k, v in node_ids.items()}
+        bound_ports = {}
+        for node_id, node_interfaces in state['interfaces'].items():
+            if node_id not in node_names:
+                continue
+            node_name = node_names[node_id]
+            self._node_cache.set(node_name, node_id)
+            self._node_position_set(
+                node_name, state['nodes'][node_id].get('left'), state['nodes'][node_id].get('top'))
+            self._interface_cache.set(
+                node_name, {v['name']: str(i) for i, v in enumerate(node_interfaces)})
+            for v in node_interfaces:
+                if str(v.get('network_id', 0)) not in ('0', ''):
+                    bound_ports[(node_name, v['name'])] = str(v['network_id'])
+        for bridge_name, network_id in bridge_ids.items():
+            self._bridge_cache.set(bridge_name, network_id)
+
+        # wanted state from rows
+        wanted_nodes = set()
+        wanted_bridges = set()
+        bridge_links = {}
+        node_links = []
+        for sheet, header, v_strip in sheet_rows:
+            args = {i: j for i, j in zip(header, v_strip) if j != ''}
+            try:
+                if sheet.startswith('add_node'):
+                    payload = self._node_row_payload(sheet, args)
+                    name, node_id = payload['name'], node_ids.get(payload['name'])
+                    wanted_nodes.add(name)
+                    current = state['nodes'].get(node_id, {})
+                    keys = self._reconcile_node_keys
+                    create_key, update_key = 'create_nodes', 'update_nodes'
+                elif sheet == 'add_network':
+                    payload = self._templates['network'].payload(args)
+                    name, node_id = payload['name'], bridge_ids.get(payload['name'])
+                    wanted_bridges.add(name)
+                    current = state['networks'].get(node_id, {})
+                    keys = self._reconcile_network_keys
+                    create_key, update_key = 'create_networks', 'update_networks'
+                elif sheet == 'connect_node_to_bridge':
+                    bridge_links[(args['node_name'], args['node_port'])] = args['bridge_name']
+                    continue
+                elif sheet == 'connect_node_to_node':
+                    node_links.append((
+                        (args['first_node'], args['first_port']),
+                        (args['second_node'], args['second_port'])))
+                    continue
+                else:
+                    logger.info('Excel sheet <%s> skipped in reconcile', sheet)
+                    continue
+                if node_id is None:
+                    plan[create_key].append((sheet, header, v_strip))
+                    continue
+                changes = {
+                    k: payload[k] for k in keys
+                    if k in payload and payload[k] != '' and k in current
+                    and str(payload[k]) != str(current[k])
+                }
+                if changes:
+                    plan[update_key].append((node_id, changes))
+            except Exception as e:
+                logger.error(
+                    'Excel sheet <%s> line <%s> not completed: %s', sheet, v_strip, e)
+
+        plan['delete_nodes'].extend(
+            node_id for name, node_id in node_ids.items() if name not in wanted_nodes)
+        plan['delete_networks'].extend(
+            network_id for name, network_id in bridge_ids.items() if name not in wanted_bridges)
+        # names of deleted kept nodes (duplicates have same name as kept node)
+        deleted_node_names = {
+            name for name, node_id in node_ids.items() if node_id in plan['delete_nodes']}
+
+        # links, ports already bound as wanted are kept
+        network_ports = {}
+        for port, network_id in bound_ports.items():
+            network_ports.setdefault(network_id, set()).add(port)
+        wanted_ports = set()
+        for port, bridge_name in bridge_links.items():
+            wanted_ports.add(port)
+            if bridge_ids.get(bridge_name) is None or bound_ports.get(port) != bridge_ids[bridge_name]:
+                plan['create_links'].append(
+                    {'node_name': port[0], 'node_port': port[1], 'bridge_name': bridge_name})
+        for first, second in node_links:
+            wanted_ports.update((first, second))
+            network_id = bound_ports.get(first)
+            if not (network_id and bound_ports.get(second) == network_id
+                    and str(state['networks'].get(network_id, {}).get('visibility')) == '0'
+                    and network_ports[network_id] == {first, second}):
+                plan['create_links'].append({
+                    'first_node': first[0], 'first_port': first[1],
+                    'second_node': second[0], 'second_port': second[1]})
+        # ports of deleted nodes are detached with node delete
+        plan['detach_ports'] = [
+            i for i in bound_ports if i not in wanted_ports and i[0] not in deleted_node_names]
+
+        # invisible link networks without port after plan are deleted
+        relinked_ports = {
+            j for i in plan['create_links'] for j in (
+                (i.get('node_name'), i.get('node_port')),
+                (i.get('first_node'), i.get('first_port')),
+                (i.get('second_node'), i.get('second_port')))
+        }
+        used_networks = {
+            network_id for port, network_id in bound_ports.items()
+            if port in wanted_ports and port not in relinked_ports
+            and port[0] not in deleted_node_names
+        }
+        plan['delete_networks'].extend(
+            network_id for network_id, network in state['networks'].items()
+            if str(network.get('visibility')) != '1' and network_id not in used_networks)
+
+        logger.info(
+            'reconcile plan %s: %s', self.lab_path,
+            ', '.join(f'{k}={len(v)}' for k, v in plan.items()))
+        if not apply:
+            return plan
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda node_id: self._delete(f'{lab_url}/nodes/{node_id}'),
+                plan['delete_nodes']))
+            for name in deleted_node_names:
+                self.invalidate_cache('node', name)
+            list(executor.map(
+                lambda row: Evenger._excel_row_run(self, *row),
+                plan['create_nodes'] + plan['create_networks']))
+            list(executor.map(
+                lambda update: self._put(
+                    f'{lab_url}/nodes/{update[0]}', json.dumps(update[1])),
+                plan['update_nodes']))
+            list(executor.map(
+                lambda update: self._put(
+                    f'{lab_url}/networks/{update[0]}', json.dumps(update[1])),
+                plan['update_networks']))
+
+            node_detach = {}
+            for node_name, node_port in plan['detach_ports']:
+                node_detach.setdefault(node_ids[node_name], {})[
+                    self._node_interface_id(node_name, node_port)] = ''
+            list(executor.map(
+                lambda node_id: self._put(
+                    f'{lab_url}/nodes/{node_id}/interfaces', json.dumps(node_detach[node_id])),
+                node_detach))
+
+        if plan['create_links']:
+            self.connect_links(plan['create_links'], workers=workers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda network_id: self._delete(f'{lab_url}/networks/{network_id}'),
+                plan['delete_networks']))
+        self.invalidate_cache('bridge')
+        logger.info('reconcile %s done!', self.lab_path)
+        return plan
+
+    @_timed_operation('teardown')
+    def _nodes_action(self, action, node_names=None, workers=None):
+        """ run node action (stop or wipe) concurrently, one api call per node
+
+        ### Returns:
+            - {node_name: api response or error text}
+
+        """
+        workers = int(workers or self.pool_size)
+        node_name_id_dict = self._node_name_id_dict_create()
+        if node_names is None:
+            node_names = list(node_name_id_dict)
+
+        def node_action(node_name):
+            try:
+                if node_name not in node_name_id_dict:
+                    raise ValueError(f'node <{node_name}> not in lab')
+                res = self._get(
+                    f'/api/labs/{self.lab_path}.unl/nodes/{node_name_id_dict[node_name]}/{action}')
+                if self._response_failed(res):
+                    logger.error('%s node %s failed: %s', action, node_name, res)
+                return node_name, res
+            except Exception as e:
+                logger.error('%s node %s failed: %s', action, node_name, e)
+                return node_name, str(e)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(executor.map(
+                self.call_stats.bind(node_action), node_names))
+        logger.info(
+            '%s nodes %s: %s nodes done!', action, self.lab_path, len(results))
+        return results
+
+    def stop_nodes(self, node_names=None, workers=None):
+        """ stop nodes concurrently
+
+        ### Args:
+            - node_names (optional) : ['7750_test_1', '7750_test_2'] (all lab nodes if not set)
+            - workers (optional) : parallel api calls (default: pool_size)
+
+        ### Returns:
+            - {node_name: api response or error text}
+
+        """
+        return self._nodes_action('stop', node_names, workers)
+
+    def wipe_nodes(self, node_names=None, workers=None):
+        """ wipe nodes concurrently (node disk is reset to image, node must be stopped)
+
+        ### Args:
+            - node_names (optional) : ['7750_test_1', '7750_test_2'] (all lab nodes if not set)
+            - workers (optional) : parallel api calls (default: pool_size)
+
+        ### Returns:
+            - {node_name: api response or error text}
+
+        """
+        return self._nodes_action('wipe', node_names, workers)
+
+    @_timed_operation('teardown')
+    def delete_orphan_networks(self, workers=None):
+        """ delete invisible node to node link networks (Bridge_invisible) without attached interface
+        (e.g. left by failed connect_node_to_node or deleted nodes)
+
+        ### Args:
+            - workers (optional) : parallel api calls (default: pool_size)
+
+        ### Returns:
+            - deleted network ids (list)
+
+        """
+        workers = int(workers or self.pool_size)
+        state = self.get_lab_state(workers)
+        used_networks = {
+            str(v['network_id']) for node_interfaces in state['interfaces'].values()
+            for v in node_interfaces if str(v.get('network_id', 0)) not in ('0', '')
+        }
+        orphan_networks = [
+            network_id for network_id, network in state['networks'].items()
+            if (str(network.get('visibility')) == '0' or network.get('name') == 'Bridge_invisible')
+            and str(network_id) not in used_networks
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.call_stats.bind(
+                lambda network_id: self._delete(
+                    f'/api/labs/{self.lab_path}.unl/networks/{network_id}')),
+                orphan_networks))
+        self.invalidate_cache('bridge')
+        logger.info(
+            'delete_orphan_networks %s: %s networks deleted!', self.lab_path, len(orphan_networks))
+        return orphan_networks
+
+    @_timed_operation('teardown')
+    def delete_lab(self, stop=True, workers=None):
+        """ delete lab, nodes are stopped concurrently before (running node processes
+        are not stopped by eve-ng on lab delete)
+
+        ### Args:
+            - stop (optional) : True (False deletes lab without stopping nodes)
+            - workers (optional) : parallel api calls (default: pool_size)
+
+        ### Returns:
+            - api response
+
+        """
+        if stop:
+            self.stop_nodes(workers=workers)
+        res = self._delete(f'/api/labs/{self.lab_path}.unl')
+        self.invalidate_cache()
+        logger.info('delete_lab %s done!', self.lab_path)
+        return res
+
+    def clone_lab(self, lab_path):
+        """ copy lab file of this lab to new lab on same eve-ng server, nodes (with startup configs),
+        networks and links are copied with same ids, one api call (two if lab folder is other)
+
+        ### Args:
+            - lab_path : my_lab_folder/my_lab_2 (lab folder must exist, lab must not exist)
+
+        ### Returns:
+            - Evenger object of new lab (same login, lab caches are new)
+
+        """
+        evenger_object = self._lab_object(lab_path)
+        name, path = self._lab_name_path(lab_path)
+        source_name, source_path = self._lab_name_path(self.lab_path)
+        with evenger_object.call_stats.operation('clone'):
+            # eve-ng creates clone in folder of source lab, then it is moved to lab folder
+            res = evenger_object._post(
+                '/api/labs', {'source': f'/{self.lab_path}.unl', 'name': name})
+            if not isinstance(res, dict) or res.get('code') != 200:
+                raise ValueError(f'lab <{self.lab_path}> not cloned to <{lab_path}>: {res}')
+            if path != source_path:
+                clone_path = self.lab_path[:-len(source_name)] + name
+                res = evenger_object._put(
+                    f'/api/labs/{clone_path}.unl/move', json.dumps({'path': path}))
+                if not isinstance(res, dict) or res.get('code') != 200:
+                    raise ValueError(f'lab <{clone_path}> not moved to <{path}>: {res}')
+        logger.info('clone_lab %s to %s done!', self.lab_path, lab_path)
+        return evenger_object
+
+    def export_lab(self, filename=''):
+        """ export lab as eve-ng zip (lab file with nodes, startup configs, networks and links),
+        two api calls, zip can be imported many times to any eve-ng server (look <Evenger.import_lab>)
+
+        ### Args:
+            - filename (optional) : my_lab.zip (zip is also written to file)
+
+        ### Returns:
+            - zip file bytes
+
+        """
+        with self.call_stats.operation('export'):
+            res = self._post('/api/export', {
+                '0': f'/{self.lab_path}.unl', 'path': self._lab_name_path(self.lab_path)[1]})
+            if not isinstance(res, dict) or res.get('code') != 200:
+                raise ValueError(f'lab <{self.lab_path}> not exported: {res}')
+            res = self._request('GET', res['data'])
+            if res.status_code != 200:
+                raise ValueError(f'lab export <{res.request.path_url}> not downloaded: {res.status_code}')
+        if filename:
+            with open(filename, 'wb') as file:
+                file.write(res.content)
+        logger.info('export_lab %s done!', self.lab_path)
+        return res.content
+
+    @staticmethod
+    def _lab_file_renamed(lab_text, name):
+        """ return eve-ng lab file text with new lab name and new lab id (uuid) """
+        import html
+        import uuid
+
+        def rename(match):
+            tag = re.sub(r'\bname="[^"]*"', lambda _: f'name="{html.escape(name)}"', match.group(0), count=1)
+            return re.sub(r'\bid="[^"]*"', lambda _: f'id="{uuid.uuid4()}"', tag, count=1)
+        return Evenger._LAB_TAG.sub(rename, lab_text, count=1)
+
+    def import_lab(self, lab_export, lab_path=''):
+        """ import lab export as new lab, lab name and lab id are replaced in memory so same
+        export can be imported many times, one api call
+
+        ### Args:
+            - lab_export : zip file bytes or zip filename of <Evenger.export_lab> (one lab file)
+            - lab_path (optional) : my_lab_folder/my_lab_2 (default: lab_path of this object,
+              lab folder must exist, lab must not exist)
+
+        ### Returns:
+            - Evenger object of new lab (same login, lab caches are new)
+
+        """
+        import zipfile
+
+        evenger_object = self._lab_object(lab_path or self.lab_path)
+        name, path = self._lab_name_path(evenger_object.lab_path)
+        if isinstance(lab_export, str):
+            with open(lab_export, 'rb') as file:
+                lab_export = file.read()
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(lab_export)) as source_zip, \
+                zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as target_zip:
+            lab_files = [i for i in source_zip.namelist() if i.endswith('.unl')]
+            if len(lab_files) != 1:
+                raise ValueError(f'lab export must have one lab file, not {len(lab_files)}')
+            target_zip.writestr(f'{name}.unl', self._lab_file_renamed(
+                source_zip.read(lab_files[0]).decode(), name))
+        with evenger_object.call_stats.operation('import'):
+            res = evenger_object._request(
+                'POST', '/api/import', data={'path': path},
+                files={'file': (f'{name}.zip', buffer.getvalue(), 'application/zip')})
+            self._log_response(res)
+            if res.status_code != 200:
+                raise ValueError(f'lab <{evenger_object.lab_path}> not imported: {res.status_code} {res.text}')
+        logger.info('import_lab %s done!', evenger_object.lab_path)
+        return evenger_object
+
+    async def _poll_running_nodes(self, running_nodes, interval=2):
+        """ set event of running nodes (eve-ng node status 2) in running_nodes {node name: asyncio.Event}
+        every interval, until all nodes are running
+        """
+        while not all(i.is_set() for i in running_nodes.values()):
+            try:
+                nodes_dict = (await asyncio.to_thread(
+                    self._get, f'/api/labs/{self.lab_path}.unl/nodes'))['data']
+                for v in nodes_dict.values():
+                    if int(v.get('status', 0)) >= 2 and v['name'] in running_nodes:
+                        running_nodes[v['name']].set()
+            except Exception as e:
+                logger.error('Node status check failed: %s', e)
+            await asyncio.sleep(interval)
+
+    async def _wait_node_ready(self, node_name, node_config_text, node_telnet_ip, node_telnet_port,
+                               running_nodes, ready_deadline, no_prompt_deadline=None, interval=5):
+        """ wait node running status and console prompt (first _EXPECT of config), return open console
+        (without _EXPECT in config, wait until no_prompt_deadline after running status)
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                running_nodes[node_name].wait(), max(ready_deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise TimeoutError('node status is not running')
+
+        first_expect = next((
+            i.strip().removeprefix('_EXPECT:').strip() for i in node_config_text.splitlines()
+            if i.strip().startswith('_EXPECT:')
+        ), '')
+        if not first_expect:
+            await asyncio.sleep(max(min(no_prompt_deadline or ready_deadline, ready_deadline) - loop.time(), 0))
+            return None
+
+        while True:
+            try:
+                console = await TelnetConsole.open(node_telnet_ip, node_telnet_port)
+                break
+            except (OSError, asyncio.TimeoutError):
+                if loop.time() >= ready_deadline:
+                    raise TimeoutError('node console is not reachable')
+                await asyncio.sleep(min(interval, ready_deadline - loop.time()))
+        if await console.wait_prompt(first_expect.encode(), ready_deadline, interval):
+            return console
+        await console.close()
+        raise TimeoutError(f'node console prompt <{first_expect}> not received')
+
+    @staticmethod
+    def _write_transcript(transcript_folder, node_name, node_telnet_url, transcript):
+        """ append console transcript to rotating file <transcript_folder>/<node_name>.log """
+        from logging.handlers import RotatingFileHandler
+
+        os.makedirs(transcript_folder, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(transcript_folder, f'{node_name}.log'),
+            maxBytes=Evenger._transcript_max_bytes,
+            backupCount=Evenger._transcript_backup_count)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        # own logger per node, transcripts are not written to package log
+        transcript_logger = logging.getLogger(f'evenger.transcript.{node_name}')
+        transcript_logger.propagate = False
+        transcript_logger.setLevel(logging.INFO)
+        transcript_logger.addHandler(handler)
+        try:
+            transcript_logger.info('Telnet outputs for %s %s\n%s',
+                                   node_name, node_telnet_url, transcript)
+        finally:
+            transcript_logger.removeHandler(handler)
+            handler.close()
+
+    async def _config_node_with_telnet(self, node_name, node_telnet_url, config_folder, transcript_folder='',
+                                       semaphore=None, running_nodes=None, ready_deadline=None, node_configs=None,
+                                       no_prompt_deadline=None):
+        """ send node config via telnet (after node ready if ready_deadline), return node result dict """
+        result = {
+            'node': node_name,
+            'url': node_telnet_url,
+            'status': 'failed',
+            'duration': 0.0,
+            'ready_duration': 0.0,
+            'output': None
+        }
+        start_time = time.monotonic()
+        try:
+            node_config_text = self._node_config_text(node_name, config_folder, node_configs)
+            node_telnet_ip, node_telnet_port = node_telnet_url.split(
+                ':')
+            console = None
+            if ready_deadline is not None:
+                try:
+                    console = await self._wait_node_ready(
+                        node_name, node_config_text, node_telnet_ip, node_telnet_port,
+                        running_nodes, ready_deadline, no_prompt_deadline)
+                except (TimeoutError, asyncio.TimeoutError):
+                    result['status'] = 'not ready'
+                    raise
+                result['ready_duration'] = round(
+                    time.monotonic() - start_time, 3)
+                logger.info(
+                    'Node ready for %s %s in %s seconds',
+                    node_name, node_telnet_url, result['ready_duration'])
+            async with semaphore or asyncio.Semaphore(1):
+                node_telnet_result = await self._send_telnet_commands_async(
+                    node_config_text, node_telnet_ip, node_telnet_port, console=console)
+            result['output'] = node_telnet_result
+            if transcript_folder and node_telnet_result is not None:
+                await asyncio.to_thread(
+                    self._write_transcript, transcript_folder, node_name, node_telnet_url, node_telnet_result)
+            if node_telnet_result is not None:
+                result['status'] = 'done'
+                logger.info(
+                    'Telnet done for %s %s', node_name, node_telnet_url)
+        except Exception as e:
+            logger.error(
+                'Telnet problem for %s %s: %s', node_name, node_telnet_url, e)
+        result['duration'] = round(time.monotonic() - start_time, 3)
+        self.call_stats.record(
+            'TELNET', node_telnet_url, result['status'],
+            result['duration'] - result['ready_duration'],
+            response_bytes=len(result['output'] or ''), operation='telnet')
+        return result
+
+    async def _config_nodes_with_telnet(self, config_nodes, config_folder, transcript_folder, workers, ready_timeout=0,
+                                        node_configs=None):
+        """ configure nodes in one event loop, max <workers> telnet config sessions at same time
+        (with ready_timeout, each node is configured as soon as it is ready)
+        """
+        semaphore = asyncio.Semaphore(workers)
+        running_nodes = {node_name: asyncio.Event() for node_name, _ in config_nodes}
+        ready_deadline = None
+        no_prompt_deadline = None
+        poll_task = None
+        if ready_timeout:
+            ready_deadline = asyncio.get_running_loop().time() + ready_timeout
+            no_prompt_deadline = asyncio.get_running_loop().time() + min(
+                ready_timeout, self._no_prompt_ready_time)
+            poll_task = asyncio.create_task(
+                self._poll_running_nodes(running_nodes))
+        try:
+            return await asyncio.gather(*(
+                self._config_node_with_telnet(
+                    node_name, node_telnet_url, config_folder, transcript_folder,
+                    semaphore, running_nodes, ready_deadline, node_configs, no_prompt_deadline)
+                for node_name, node_telnet_url in config_nodes
+            ))
+        finally:
+            if poll_task:
+                poll_task.cancel()
+
+    @staticmethod
+    def _has_node_config(node_name, config_folder, node_configs=None):
+        return node_name in (node_configs or {}) or os.path.exists(f'{config_folder}/{node_name}.txt')
+
+    @staticmethod
+    def _node_config_text(node_name, config_folder, node_configs=None):
+        """ node config of node_configs (text or function returns text, rendered here) or config file """
+        node_config = (node_configs or {}).get(node_name)
+        if node_config is None:
+            with open(f'{config_folder}/{node_name}.txt') as file:
+                return file.read()
+        return node_config() if callable(node_config) else node_config
+
+    @_timed_operation('startup_config')
+    def upload_startup_configs(self, config_folder='configs', workers=None, node_configs=None):
+        """ upload node config files concurrently as eve-ng startup config (applied on node boot, upload
+        before nodes start), config file same as node name with .txt extension e.g. node_1.txt
+        (only config files without console commands _EXPECT/_SLEEP/_TIMEOUT for node templates with
+        startup config support on server, other nodes and failed uploads are left for
+        <Evenger.config_with_telnet>)
+
+        ### Args:
+            - config_folder : configs
+            - workers (optional) : parallel uploads (default: pool_size)
+            - node_configs (optional) : {node_name: config text or function returns text} used instead of
+              config files, rendered in upload workers (look <Evenger.node_configs>)
+
+        ### Returns:
+            - node results e.g. [{'node': 'node_1', 'delivery': 'startup', 'status': 'done', 'duration': 0.1, 'error': ''},
+              {'node': 'node_2', 'delivery': 'console', 'status': 'pending', 'duration': 0.0,
+              'error': 'template <linux> has no startup config'}, ...]
+              (status failed with delivery startup if config file is not readable or template not rendered)
+
+        """
+        workers = int(workers or self.pool_size)
+        lab_url = f'/api/labs/{self.lab_path}.unl'
+        # eve-ng returns empty list for lab without node
+        nodes_dict = self._get(f'{lab_url}/nodes')['data'] or {}
+        config_nodes = {
+            v['name']: (k, v.get('template')) for k, v in nodes_dict.items()
+            if self._has_node_config(v['name'], config_folder, node_configs)
+        }
+        # templates with startup config support have config option
+        templates = list({i[1] for i in config_nodes.values()})
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            template_options = dict(zip(templates, executor.map(
+                self.call_stats.bind(self._template_options), templates)))
+
+        def upload_node_config(node_name):
+            node_id, template = config_nodes[node_name]
+            result = {
+                'node': node_name,
+                'delivery': 'console',
+                'status': 'pending',
+                'duration': 0.0,
+                'error': ''
+            }
+            if 'config' not in (template_options.get(template) or {}):
+                result['error'] = f'template <{template}> has no startup config'
+                return result
+            start_time = time.monotonic()
+            try:
+                try:
+                    config_text = self._node_config_text(node_name, config_folder, node_configs)
+                except Exception as e:
+                    # config not readable/renderable is not sent with telnet either
+                    result['delivery'] = 'startup'
+                    result['status'] = 'failed'
+                    result['error'] = f'config not created: {e}'
+                    logger.error('Startup config %s failed: %s', node_name, result['error'])
+                    return result
+                if any(i.strip().startswith(('_EXPECT:', '_SLEEP:', '_TIMEOUT:'))
+                       for i in config_text.splitlines()):
+                    result['error'] = 'console commands in config file'
+                    return result
+                for url, data in ((f'{lab_url}/nodes/{node_id}', {'id': int(node_id), 'config': '1'}),
+                                  (f'{lab_url}/configs/{node_id}', {'data': config_text})):
+                    res = self._put(url, json.dumps(data))
+                    if self._response_failed(res):
+                        raise ValueError(f'<{url}> not updated: {res}')
+                result['delivery'] = 'startup'
+                result['status'] = 'done'
+            except Exception as e:
+                result['error'] = str(e)
+                logger.error(
+                    'Startup config %s failed, node is left for telnet: %s', node_name, e)
+            finally:
+                result['duration'] = round(time.monotonic() - start_time, 3)
+            return result
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                self.call_stats.bind(upload_node_config), config_nodes))
+        logger.info(
+            'Startup config summary: %s uploaded, %s failed, %s left for telnet',
+            sum(1 for i in results if i['status'] == 'done'),
+            sum(1 for i in results if i['status'] == 'failed'),
+            sum(1 for i in results if i['delivery'] == 'console'))
+        return results
+
+    def config_with_telnet(self, config_folder='configs', log_debug=False, workers=1, ready_timeout=0,
+                           transcript_folder='transcripts', node_names=None, node_configs=None):
         """ make configuration for all nodes via eve-ng telnet
         (in config_folder, config file must be same as eve-ng node name with .txt extension e.g. node_1.txt)
 
@@ -488,6 +2373,19 @@ class Evenger:
 
         ### Args:
             - config_folder : configs
+            - log_debug (optional) : False (write telnet outputs to rotating file per node in transcript_folder)
+            - workers (optional) : 1 (max parallel telnet sessions)
+            - ready_timeout (optional) : 0 (seconds, if set each node is configured when ready:
+              node status is running and console prompt of first _EXPECT received, max wait ready_timeout,
+              running nodes with config without _EXPECT are configured after max 180 seconds)
+            - transcript_folder (optional) : transcripts (telnet outputs folder for log_debug, <node_name>.log)
+            - node_names (optional) : ['node_1', 'node_2'] (only these nodes, e.g. nodes left by
+              <Evenger.upload_startup_configs>, all nodes with config file if not set)
+            - node_configs (optional) : {node_name: config text or function returns text} used instead of
+              config files, rendered when node session starts (look <Evenger.node_configs>)
+
+        ### Returns:
+            - node results e.g. [{'node': 'node_1', 'url': '172.18.18.18:32769', 'status': 'done', 'duration': 12.5, 'ready_duration': 9.1, 'output': '...'}, ...]
 
         """
         all_nodes_dict = self._get(
@@ -495,126 +2393,985 @@ class Evenger:
         all_nodes_telnet_url = {
             v['name']: v['url'].split('//')[1] for k, v in all_nodes_dict.items() if v['url'].startswith('telnet')
         }
-        for node_name, node_telnet_url in all_nodes_telnet_url.items():
-            if os.path.exists(f'{config_folder}/{node_name}.txt'):
-                try:
-                    with open(f'{config_folder}/{node_name}.txt') as file:
-                        node_config_text = file.read()
-                    node_telnet_ip, node_telnet_port = node_telnet_url.split(
-                        ':')
-                    node_telnet_result = self._send_telnet_commands(
-                        node_config_text, node_telnet_ip, node_telnet_port)
-                    if log_debug:
-                        logging.info(
-                            f'Telnet outputs for {node_name} {node_telnet_url}')
-                        logging.info(node_telnet_result)
-                    logging.info(
-                        f'Telnet done for {node_name} {node_telnet_url}')
-                except Exception as e:
-                    logging.error(
-                        f'Telnet problem for {node_name} {node_telnet_url}: {e}')
+        config_nodes = [
+            (node_name, node_telnet_url)
+            for node_name, node_telnet_url in all_nodes_telnet_url.items()
+            if self._has_node_config(node_name, config_folder, node_configs)
+            and (node_names is None or node_name in node_names)
+        ]
+        results = asyncio.run(self._config_nodes_with_telnet(
+            config_nodes, config_folder, transcript_folder if log_debug else '',
+            max(int(workers), 1), int(ready_timeout), node_configs))
+
+        for result in results:
+            logger.info(
+                'Telnet summary %s %s: %s in %s seconds',
+                result['node'], result['url'], result['status'], result['duration'])
+        logger.info(
+            'Telnet summary: %s done, %s failed',
+            sum(1 for i in results if i['status'] == 'done'),
+            sum(1 for i in results if i['status'] != 'done'))
+        return results
 
     @staticmethod
-    def excel_topology(excel_filename, auto_start='NO', jump_server_name='', config_folder='', node_boot_time=180):
-        """create topology from excel file
+    def node_config_variables(sheet_rows):
+        """ config template variables per node from node rows and node_config rows
+        (node row columns are variables of node e.g. name, management_address, with config_template
+        column for role, node_config row columns: node_name, config_template (optional if node row
+        has it) and any variable, node_config values override node row values)
+
+        ### Args:
+            - sheet_rows : [(evenger function name, header list, value list), ...] e.g. Topology.sheet_rows
+
+        ### Returns:
+            - {node_name: {'node_name': 'pe_1', 'config_template': 'pe', ...}} (only nodes with config_template)
+
+        """
+        node_variables = {}
+        for sheet, header, v_strip in sheet_rows:
+            row_args = {i: j for i, j in zip(header, v_strip) if j != ''}
+            if sheet.startswith('add_node') and row_args.get('name'):
+                node_variables[row_args['name']] = {'node_name': row_args['name'], **row_args}
+        # node_config rows after all node rows, sheet order does not matter
+        for sheet, header, v_strip in sheet_rows:
+            row_args = {i: j for i, j in zip(header, v_strip) if j != ''}
+            if sheet == 'node_config' and row_args.get('node_name'):
+                node_variables[row_args['node_name']] = {
+                    **node_variables.get(row_args['node_name'], {}), **row_args}
+        return {k: v for k, v in node_variables.items() if v.get('config_template')}
+
+    @staticmethod
+    def node_configs(sheet_rows, template_folder='configs'):
+        """ per node configs of role templates (<template_folder>/<role>.j2) and node variables
+        (look <Evenger.node_config_variables>), templates are compiled once here and each config is
+        rendered when it is pushed (no config file is written)
+
+        ### Args:
+            - sheet_rows : [(evenger function name, header list, value list), ...] e.g. Topology.sheet_rows
+            - template_folder (optional) : configs
+
+        ### Returns:
+            - {node_name: function returns config text} for node_configs of
+              <Evenger.upload_startup_configs> and <Evenger.config_with_telnet>
+
+        """
+        return ConfigRenderer(template_folder).node_configs(
+            Evenger.node_config_variables(sheet_rows))
+
+    @staticmethod
+    def _topology_sheet_names():
+        """ evenger function and data sheet names, sheets with other names are not topology rows """
+        return {name for name in dir(Evenger) if not name.startswith('_')} | set(Evenger._data_sheets)
+
+    @classmethod
+    def register_topology_reader(cls, suffix, reader):
+        """ register topology reader for file suffix (look <Evenger.topology_load>)
+
+        ### Args:
+            - suffix : .toml
+            - reader : function(filename) returns Topology
+
+        """
+        cls._topology_readers[suffix.lower()] = reader
+
+    @staticmethod
+    def topology_load(source):
+        """ load topology from excel file, csv folder or yaml/json file
+
+        ### Args:
+            - source : evenger_topology.xlsx, my_csv_folder, evenger_topology.yaml or evenger_topology.json
+
+        ### Returns:
+            - Topology (lab_info, sheet_rows)
+
+        """
+        if os.path.isdir(source):
+            return Evenger._topology_expand(Evenger._csv_topology_load(source))
+        suffix = os.path.splitext(source)[1].lower()
+        reader = Evenger._topology_readers.get(suffix)
+        if reader is None:
+            raise ValueError(f'Topology source <{source}> is not supported')
+        if isinstance(reader, str):
+            reader = getattr(Evenger, reader)
+        return Evenger._topology_expand(reader(source))
+
+    @staticmethod
+    def _topology_expand(topology):
+        """ expand generate_mesh rows with <Evenger.mesh_rows>, generated node rows are kept
+        in row order and all connection rows are moved after node/network rows
+        """
+        if not any(sheet == 'generate_mesh' for sheet, _, _ in topology.sheet_rows):
+            return topology
+        sheet_rows = []
+        connection_rows = []
+        for sheet, header, v_strip in topology.sheet_rows:
+            if sheet != 'generate_mesh':
+                (connection_rows if sheet.startswith('connect_') else sheet_rows).append(
+                    (sheet, header, v_strip))
+                continue
+            mesh_args = {
+                i: j for i, j in zip(header, v_strip) if j != '' and i != 'workers'}
+            try:
+                for row in Evenger.mesh_rows(**mesh_args):
+                    (connection_rows if row[0].startswith('connect_') else sheet_rows).append(row)
+            except Exception as e:
+                logger.error(
+                    'Excel sheet <%s> line <%s> not expanded: %s', sheet, v_strip, e)
+        topology.sheet_rows = sheet_rows + connection_rows
+        return topology
+
+    @staticmethod
+    def layout_rows(sheet_rows, layout='grid', spacing=150, overwrite=False, iterations=50):
+        """ set left/top of node and bridge rows (add_node*, add_network) from link graph
+
+        ### Args:
+            - sheet_rows : [(evenger function name, header list, value list), ...] e.g. Topology.sheet_rows
+            - layout (optional) : grid, layered (rows by hop distance from highest degree nodes
+              e.g. spines above leafs) or force (force-directed, numpy is used if installed)
+            - spacing (optional) : 150 (pixels between nodes)
+            - overwrite (optional) : False (True also moves rows with left/top, False keeps them
+              and uses them as fixed points of force layout)
+            - iterations (optional) : 50 (force layout iterations)
+
+        ### Returns:
+            - new sheet rows (node and bridge rows with left/top)
+
+        """
+        spacing = int(spacing)
+        names = []
+        positions = {}
+        for sheet, header, v_strip in sheet_rows:
+            if not (sheet.startswith('add_node') or sheet == 'add_network'):
+                continue
+            args = dict(zip(header, v_strip))
+            if sheet == 'add_network' and str(args.get('visibility', '1')) == '0':
+                continue
+            if args.get('name') and args['name'] not in positions:
+                names.append(args['name'])
+                positions[args['name']] = None
+                if not overwrite and args.get('left') and args.get('top'):
+                    positions[args['name']] = (float(args['left']), float(args['top']))
+
+        edges = []
+        for sheet, header, v_strip in sheet_rows:
+            args = dict(zip(header, v_strip))
+            if sheet == 'connect_node_to_node':
+                edge = (args.get('first_node'), args.get('second_node'))
+            elif sheet == 'connect_node_to_bridge':
+                edge = (args.get('node_name'), args.get('bridge_name'))
+            else:
+                continue
+            if edge[0] in positions and edge[1] in positions:
+                edges.append(edge)
+
+        free_names = [i for i in names if positions[i] is None]
+        if layout == 'grid':
+            new_positions = Evenger._layout_grid(free_names, spacing)
+        elif layout == 'layered':
+            new_positions = Evenger._layout_layered(free_names, edges, spacing)
+        elif layout == 'force':
+            new_positions = Evenger._layout_force(names, edges, positions, spacing, int(iterations))
+        else:
+            raise ValueError(f'layout <{layout}> must be grid, layered or force')
+        fixed_tops = [i[1] for i in positions.values() if i is not None]
+        if new_positions and (layout != 'force' or not fixed_tops):
+            # canvas starts from spacing/2, below rows with left/top
+            min_left = min(i[0] for i in new_positions.values())
+            min_top = min(i[1] for i in new_positions.values())
+            start_top = max(fixed_tops) + spacing if fixed_tops else spacing // 2
+            new_positions = {
+                k: (v[0] - min_left + spacing // 2, v[1] - min_top + start_top)
+                for k, v in new_positions.items()}
+
+        new_rows = []
+        for sheet, header, v_strip in sheet_rows:
+            name = dict(zip(header, v_strip)).get('name')
+            if name in new_positions and (sheet.startswith('add_node') or sheet == 'add_network'):
+                args = dict(zip(header, v_strip))
+                args['left'], args['top'] = (str(int(round(i))) for i in new_positions[name])
+                header, v_strip = list(args), list(args.values())
+            new_rows.append((sheet, header, v_strip))
+        return new_rows
+
+    @staticmethod
+    def _layout_grid(names, spacing):
+        """ names in rows of sqrt(count) columns """
+        columns = max(int(math.ceil(math.sqrt(len(names)))), 1)
+        return {
+            name: (index % columns * spacing, index // columns * spacing)
+            for index, name in enumerate(names)}
+
+    @staticmethod
+    def _layout_layered(names, edges, spacing):
+        """ one row per hop distance from highest degree nodes of each connected part """
+        order = {name: i for i, name in enumerate(names)}
+        neighbours = {i: set() for i in names}
+        for first, second in edges:
+            if first in neighbours and second in neighbours:
+                neighbours[first].add(second)
+                neighbours[second].add(first)
+        layer = {}
+        for name in names:
+            if name in layer:
+                continue
+            # connected part of name, bfs from its highest degree nodes
+            part = {name}
+            queue = [name]
+            for node in queue:
+                for i in neighbours[node] - part:
+                    part.add(i)
+                    queue.append(i)
+            max_degree = max(len(neighbours[i]) for i in part)
+            queue = sorted(
+                (i for i in part if len(neighbours[i]) == max_degree), key=order.get)
+            layer.update((i, 0) for i in queue)
+            for node in queue:
+                for i in sorted(neighbours[node] - layer.keys(), key=order.get):
+                    layer[i] = layer[node] + 1
+                    queue.append(i)
+        rows = {}
+        for name in names:
+            rows.setdefault(layer[name], []).append(name)
+        width = max((len(i) for i in rows.values()), default=0)
+        positions = {}
+        top = 0
+        for _, row_names in sorted(rows.items()):
+            # wide layers are wrapped to rows of max 40 nodes
+            columns = min(len(row_names), 40)
+            offset = (min(width, 40) - columns) * spacing / 2
+            for index, name in enumerate(row_names):
+                positions[name] = (
+                    offset + index % columns * spacing, top + index // columns * spacing)
+            top += (len(row_names) + columns - 1) // columns * spacing * 2
+        return positions
+
+    @staticmethod
+    def _layout_force(names, edges, fixed_positions, spacing, iterations):
+        """ Fruchterman-Reingold force layout with repulsion cutoff of 2 * spacing,
+        rows with positions are fixed, others start from grid
+        (neighbour cell grid, vectorized with numpy if installed, same result without numpy)
+        """
+        index = {name: i for i, name in enumerate(names)}
+        start = Evenger._layout_grid(names, spacing)
+        positions = [
+            list(fixed_positions.get(name) or start[name]) for name in names]
+        fixed = [fixed_positions.get(name) is not None for name in names]
+        # deterministic small jitter, nodes on same line are not stuck
+        for i, position in enumerate(positions):
+            if not fixed[i]:
+                position[0] += (i * 7919 % 13 - 6) * spacing / 100
+                position[1] += (i * 104729 % 11 - 5) * spacing / 100
+        edge_index = [(index[i], index[j]) for i, j in edges if i != j]
+        temperature = spacing * max(math.sqrt(len(names)), 1) / 2
+        cooling = temperature / max(iterations, 1)
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None and names:
+            result = Evenger._layout_force_numpy(
+                numpy, positions, fixed, edge_index, spacing, iterations, temperature, cooling)
+        else:
+            result = Evenger._layout_force_python(
+                positions, fixed, edge_index, spacing, iterations, temperature, cooling)
+        return {
+            name: tuple(result[i]) for i, name in enumerate(names) if not fixed[i]}
+
+    @staticmethod
+    def _layout_force_python(positions, fixed, edge_index, spacing, iterations, temperature, cooling):
+        cell = 2 * spacing
+        for _ in range(iterations):
+            displacement = [[0.0, 0.0] for _ in positions]
+            cells = {}
+            for i, (left, top) in enumerate(positions):
+                cells.setdefault((int(left // cell), int(top // cell)), []).append(i)
+            for (cell_left, cell_top), members in cells.items():
+                near = [
+                    j for d_left in (-1, 0, 1) for d_top in (-1, 0, 1)
+                    for j in cells.get((cell_left + d_left, cell_top + d_top), ())]
+                for i in members:
+                    left, top = positions[i]
+                    for j in near:
+                        d_left = left - positions[j][0]
+                        d_top = top - positions[j][1]
+                        distance2 = d_left * d_left + d_top * d_top
+                        if i == j or distance2 >= cell * cell:
+                            continue
+                        force = spacing * spacing / max(distance2, 0.01)
+                        displacement[i][0] += d_left * force
+                        displacement[i][1] += d_top * force
+            for i, j in edge_index:
+                d_left = positions[i][0] - positions[j][0]
+                d_top = positions[i][1] - positions[j][1]
+                force = math.sqrt(d_left * d_left + d_top * d_top) / spacing
+                displacement[i][0] -= d_left * force
+                displacement[i][1] -= d_top * force
+                displacement[j][0] += d_left * force
+                displacement[j][1] += d_top * force
+            for i, (d_left, d_top) in enumerate(displacement):
+                if fixed[i]:
+                    continue
+                length = max(math.sqrt(d_left * d_left + d_top * d_top), 0.01)
+                scale = min(length, temperature) / length
+                positions[i][0] += d_left * scale
+                positions[i][1] += d_top * scale
+            temperature = max(temperature - cooling, spacing / 100)
+        return positions
+
+    @staticmethod
+    def _layout_force_numpy(numpy, positions, fixed, edge_index, spacing, iterations, temperature, cooling):
+        """ _layout_force_python vectorized, same cell grid pairs summed in same order """
+        positions = numpy.array(positions, dtype=float)
+        movable = ~numpy.array(fixed)
+        edges = numpy.array(edge_index, dtype=int).reshape(-1, 2)
+        cell = 2 * spacing
+        for _ in range(iterations):
+            # cell key of nodes, nodes of cell sorted by index
+            cells = numpy.floor_divide(positions, cell).astype(numpy.int64)
+            cells -= cells.min(axis=0) - 1
+            width = int(cells[:, 1].max()) + 2
+            keys = cells[:, 0] * width + cells[:, 1]
+            order = numpy.argsort(keys, kind='stable')
+            cell_keys, cell_starts, cell_counts = numpy.unique(
+                keys[order], return_index=True, return_counts=True)
+            first, second = [], []
+            for d_left in (-1, 0, 1):
+                for d_top in (-1, 0, 1):
+                    near_keys = keys + d_left * width + d_top
+                    near = numpy.minimum(
+                        numpy.searchsorted(cell_keys, near_keys), len(cell_keys) - 1)
+                    nodes = numpy.flatnonzero(cell_keys[near] == near_keys)
+                    counts = cell_counts[near[nodes]]
+                    first.append(numpy.repeat(nodes, counts))
+                    second.append(order[
+                        numpy.repeat(cell_starts[near[nodes]] - numpy.cumsum(counts) + counts, counts)
+                        + numpy.arange(counts.sum())])
+            first, second = numpy.concatenate(first), numpy.concatenate(second)
+            d_left = positions[first, 0] - positions[second, 0]
+            d_top = positions[first, 1] - positions[second, 1]
+            distance2 = d_left * d_left + d_top * d_top
+            near = (first != second) & (distance2 < cell * cell)
+            force = spacing * spacing / numpy.maximum(distance2[near], 0.01)
+            index = [first[near]]
+            left_parts, top_parts = [d_left[near] * force], [d_top[near] * force]
+            if len(edges):
+                d_left = positions[edges[:, 0], 0] - positions[edges[:, 1], 0]
+                d_top = positions[edges[:, 0], 1] - positions[edges[:, 1], 1]
+                force = numpy.sqrt(d_left * d_left + d_top * d_top) / spacing
+                # edge i, j pairs interleaved as in python loop
+                index.append(edges.ravel())
+                left_parts.append(numpy.stack([-(d_left * force), d_left * force], axis=1).ravel())
+                top_parts.append(numpy.stack([-(d_top * force), d_top * force], axis=1).ravel())
+            index = numpy.concatenate(index)
+            d_left = numpy.bincount(index, numpy.concatenate(left_parts), len(positions))
+            d_top = numpy.bincount(index, numpy.concatenate(top_parts), len(positions))
+            length = numpy.maximum(numpy.sqrt(d_left * d_left + d_top * d_top), 0.01)
+            scale = numpy.minimum(length, temperature) / length
+            positions[movable, 0] += (d_left * scale)[movable]
+            positions[movable, 1] += (d_top * scale)[movable]
+            temperature = max(temperature - cooling, spacing / 100)
+        return positions.tolist()
+
+    @staticmethod
+    def _excel_sheet_rows(worksheet):
+        """ stream excel sheet rows, return header and stripped rows
+        (first row is sheet info and first column is row info, both removed, empty rows skipped)
+        """
+        rows = worksheet.iter_rows(values_only=True)
+        next(rows, None)
+        header = [
+            '' if i is None else str(i).strip() for i in next(rows, ())][1:]
+        sheet_rows = []
+        for row in rows:
+            v_strip = [
+                '' if i is None else str(i).strip() for i in row[1:len(header) + 1]]
+            if any(v_strip):
+                sheet_rows.append(v_strip + [''] * (len(header) - len(v_strip)))
+        return header, sheet_rows
+
+    @staticmethod
+    def _excel_topology_load(excel_filename):
+        """ stream excel file once (openpyxl read-only) and load <_LAB_INFO> and evenger function sheets
+
+        ### Returns:
+            - Topology (lab_info, sheet_rows)
+
+        """
+        from openpyxl import load_workbook
+
+        function_sheets = Evenger._topology_sheet_names()
+        workbook = load_workbook(excel_filename, read_only=True, data_only=True)
+        try:
+            header, rows = Evenger._excel_sheet_rows(workbook['_LAB_INFO'])
+            lab_info = {
+                i: j for i, j in zip(header, rows[0]) if j != ''
+            } if rows else {}
+
+            sheet_rows = []
+            for worksheet in workbook.worksheets:
+                if worksheet.title not in function_sheets:
+                    continue
+                header, rows = Evenger._excel_sheet_rows(worksheet)
+                sheet_rows.extend(
+                    (worksheet.title, header, v_strip) for v_strip in rows)
+        finally:
+            workbook.close()
+        return Topology(lab_info=lab_info, sheet_rows=sheet_rows)
+
+    @staticmethod
+    def _csv_topology_load(csv_folder):
+        """ load topology from csv folder, one file per sheet (e.g. _LAB_INFO.csv, add_node_linux.csv)
+        (first line is header, files are read in name order: add_* before connect_*)
+
+        ### Returns:
+            - Topology (lab_info, sheet_rows)
+
+        """
+        import csv
+
+        function_sheets = Evenger._topology_sheet_names()
+        lab_info = {}
+        sheet_rows = []
+        for filename in sorted(os.listdir(csv_folder)):
+            sheet, suffix = os.path.splitext(filename)
+            if suffix.lower() != '.csv' or (sheet != '_LAB_INFO' and sheet not in function_sheets):
+                continue
+            with open(os.path.join(csv_folder, filename), newline='') as file:
+                rows = csv.reader(file)
+                header = [i.strip() for i in next(rows, [])]
+                for row in rows:
+                    v_strip = [i.strip() for i in row[:len(header)]]
+                    if not any(v_strip):
+                        continue
+                    v_strip += [''] * (len(header) - len(v_strip))
+                    if sheet == '_LAB_INFO':
+                        lab_info = {i: j for i, j in zip(header, v_strip) if j != ''}
+                        break
+                    sheet_rows.append((sheet, header, v_strip))
+        return Topology(lab_info=lab_info, sheet_rows=sheet_rows)
+
+    @staticmethod
+    def _dict_topology_load(topology_dict):
+        """ load topology from dict e.g.
+        {'_LAB_INFO': {'eveng_server_url': ...}, 'add_node_linux': [{'image': ..., 'name': ...}, ...]}
+
+        ### Returns:
+            - Topology (lab_info, sheet_rows)
+
+        """
+        function_sheets = Evenger._topology_sheet_names()
+        lab_info = {
+            k: str(v).strip() for k, v in (topology_dict.get('_LAB_INFO') or {}).items()
+            if v is not None and str(v).strip() != ''
+        }
+        sheet_rows = []
+        for sheet, rows in topology_dict.items():
+            if sheet not in function_sheets:
+                continue
+            for row in rows or []:
+                sheet_rows.append((sheet, list(row), [
+                    '' if i is None else str(i).strip() for i in row.values()]))
+        return Topology(lab_info=lab_info, sheet_rows=sheet_rows)
+
+    @staticmethod
+    def _yaml_topology_load(yaml_filename):
+        """ load topology from yaml file (same structure as <Evenger._dict_topology_load>) """
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(
+                'PyYAML is required for yaml topology: pip install evenger[yaml]')
+        with open(yaml_filename) as file:
+            return Evenger._dict_topology_load(yaml.safe_load(file) or {})
+
+    @staticmethod
+    def _json_topology_load(json_filename):
+        """ load topology from json file (same structure as <Evenger._dict_topology_load>) """
+        with open(json_filename) as file:
+            return Evenger._dict_topology_load(json.load(file))
+
+    @staticmethod
+    def _excel_row_run(evenger_object, sheet, header, v_strip, journal=None):
+        """ run evenger function (sheet name) with excel row, log error if failed
+        (with journal, completed row is skipped and new completed row is recorded)
+        """
+        step = BuildJournal.row_step(sheet, v_strip)
+        if journal and journal.done(step):
+            logger.debug(
+                'Excel sheet <%s> line <%s> already completed', sheet, v_strip)
+            return
+        try:
+            zip_line = {i: j for i, j in zip(
+                header, v_strip) if j != ''}
+            evenger_func = getattr(evenger_object, sheet)
+            result = evenger_func(**zip_line)
+            if journal:
+                journal.record(step, result)
+        except Exception as e:
+            logger.error(
+                'Excel sheet <%s> line <%s> not completed: %s', sheet, v_strip, e)
+
+    @staticmethod
+    def _excel_rows_run(evenger_object, sheet_rows, workers=1, journal=None):
+        """ run excel rows (sheet, header, v_strip) in sheet order or concurrently
+
+        With workers > 1, rows run in two phases: nodes/networks (all sheets
+        except connect_*) with thread pool and after that all connections
+        with <connect_links> (one interface update per node).
+        Rows completed in journal are skipped.
+        """
+        if workers <= 1:
+            for sheet, header, v_strip in sheet_rows:
+                Evenger._excel_row_run(
+                    evenger_object, sheet, header, v_strip, journal)
+            return
+
+        node_network_rows = [
+            i for i in sheet_rows if not i[0].startswith('connect_')]
+        connection_rows = [
+            i for i in sheet_rows if i[0].startswith('connect_')
+            and not (journal and journal.done(BuildJournal.row_step(i[0], i[2])))]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda row: Evenger._excel_row_run(
+                    evenger_object, *row, journal),
+                node_network_rows))
+
+        if not connection_rows:
+            return
+        links = [
+            {i: j for i, j in zip(header, v_strip) if j != ''}
+            for sheet, header, v_strip in connection_rows
+        ]
+        try:
+            results = evenger_object.connect_links(links, workers=workers)
+        except Exception as e:
+            logger.error('Excel connections not completed: %s', e)
+            return
+        for (sheet, header, v_strip), result in zip(connection_rows, results):
+            if result['error']:
+                logger.error(
+                    'Excel sheet <%s> line <%s> not completed: %s', sheet, v_strip, result["error"])
+            elif journal:
+                journal.record(BuildJournal.row_step(
+                    sheet, v_strip), result['network_id'])
+
+    @staticmethod
+    def excel_topology(excel_filename, auto_start='NO', jump_server_name='', config_folder='', node_boot_time=600, workers=1, reconcile='NO',
+                       journal_file='', resume='NO', report_file='', transcript_folder='', layout='', preflight='YES',
+                       startup_config='NO'):
+        """create topology from excel file (or csv folder, yaml/json file, look <Evenger.topology_load>)
 
         ### Args:
             - excel_filename : evenger_create_lab_input.xlsx
             - auto_start : NO or YES (for configuration with telnet must be YES)
             - jump_server_name (optional) : SERVER_CENTOS7 (function will return <server_vnc_host, server_vnc_port> as tuple)
             - config_folder (optional) : my_configs_folder 
-              (for making configuration with telnet, for detail info look <Evenger.config_with_telnet>)
-            - node_boot_time (optional) : 180 (second) adjust node boot time for node configuration
+              (for making configuration with telnet, for detail info look <Evenger.config_with_telnet>,
+              nodes with config_template are configured with rendered role template <role>.j2 of
+              config_folder instead of config file, look <Evenger.node_configs>)
+            - node_boot_time (optional) : 600 (second) max node boot time for node configuration
+              (each node is configured as soon as it is ready, look <Evenger.config_with_telnet> ready_timeout)
+            - workers (optional) : 1 (parallel api calls for nodes/networks and connections,
+              keep <= pool_size of _LAB_INFO, connections use <Evenger.connect_links> if > 1,
+              also max parallel telnet sessions for config_folder)
+            - reconcile (optional) : NO or YES (YES: lab is created only if not exist and only needed
+              changes are applied, look <Evenger.reconcile>)
+            - journal_file (optional) : my_evenger_topology.xlsx.journal (completed build steps and returned ids)
+            - resume (optional) : NO or YES (YES: steps completed in journal_file are skipped)
+            - report_file (optional) : build_report.json or build_report.csv (timeline of all api calls
+              and telnet sessions, json also includes latency histograms per operation, look <CallStats>)
+            - transcript_folder (optional) : transcripts (telnet outputs are written to rotating file per node)
+            - layout (optional) : grid, layered or force (left/top of nodes/bridges without left/top
+              are set from links before build, look <Evenger.layout_rows>)
+            - preflight (optional) : YES or NO (YES: node images/names, link nodes/ports and bridges
+              are checked with one server snapshot before any write, build fails with all problems
+              logged, look <Evenger.preflight>)
+            - startup_config (optional) : NO or YES (YES: config files of config_folder are uploaded as
+              startup config before nodes start, telnet is used only for other nodes,
+              look <Evenger.upload_startup_configs>)
 
         ### Return:
             - <server_vnc_host, server_vnc_port> as tuple (if jump_server_name set)
 
         """
-        # get evenger object specs
-        pd_evenger_sheet = pd.read_excel(
-            excel_filename, sheet_name='_LAB_INFO', dtype=str,
-            skiprows=[0]
-        ).fillna('')
-        header = [i.strip() for i in list(pd_evenger_sheet.keys())][1:]
-        values = pd_evenger_sheet.iterrows()
-        for i, v in values:
-            v_strip = [i.strip() for i in v.to_list()[1:]]
-            zip_line = {
-                i: j for i, j in zip(header, v_strip) if j != ''
-            }
-            evenger_object = Evenger(**zip_line)
-            break
+        topology = Evenger.topology_load(excel_filename)
+        if layout:
+            topology.sheet_rows = Evenger.layout_rows(topology.sheet_rows, layout)
+        evenger_object = Evenger._topology_build(
+            topology, auto_start, config_folder, node_boot_time, workers, reconcile,
+            journal_file, resume, report_file, transcript_folder, preflight, startup_config)
+
+        # return jump server vnc host/port
+        try:
+            if jump_server_name:
+                server_id = evenger_object._node_cache.get(jump_server_name)
+                server_vnc_url = evenger_object._get(
+                    f'/api/labs/{evenger_object.lab_path}.unl/nodes/{server_id}')['data']['url']
+                server_vnc_host, server_vnc_port = server_vnc_url.replace(
+                    'vnc://', '').split(':')
+                return server_vnc_host, server_vnc_port
+        except Exception as e:
+            logger.error(
+                'Jump_server %s vnc host/port failed: %s', jump_server_name, e)
+
+    @staticmethod
+    def _topology_build(topology, auto_start='NO', config_folder='', node_boot_time=600, workers=1, reconcile='NO',
+                        journal_file='', resume='NO', report_file='', transcript_folder='', preflight='YES',
+                        startup_config='NO'):
+        """ create lab of topology (look <Evenger.excel_topology> for args), return Evenger object """
+        evenger_object, telnet_nodes, node_configs = Evenger._topology_create(
+            topology, config_folder, workers, reconcile, journal_file, resume, preflight, startup_config)
+        Evenger._topology_start(
+            evenger_object, auto_start, config_folder, node_boot_time, workers, report_file,
+            transcript_folder, telnet_nodes, node_configs)
+        return evenger_object
+
+    @staticmethod
+    def _topology_create(topology, config_folder='', workers=1, reconcile='NO', journal_file='', resume='NO',
+                         preflight='YES', startup_config='NO'):
+        """ create lab, nodes, networks, connections and startup configs of topology (nodes are not started)
+
+        ### Returns:
+            - (Evenger object, nodes left for telnet config (None: all nodes), node configs or None)
 
+        """
+        # get evenger object specs
         try:
-            evenger_object.add_lab()
+            evenger_object = Evenger(**topology.lab_info)
         except Exception as e:
-            logging.error(
-                f'Check Excel sheet <_LAB_INFO>, evenger object not created: {e}')
+            logger.error(
+                'Check Excel sheet <_LAB_INFO>, evenger object not created: %s', e)
             raise SystemExit
 
-        sheets = list(pd.ExcelFile(excel_filename).sheet_names)
+        # all problems of rows are reported before any write
+        if preflight == 'YES':
+            # lab may already have nodes only for reconcile/resume
+            problems = evenger_object.preflight(
+                topology.sheet_rows, workers=int(workers),
+                lab_nodes=reconcile == 'YES' or resume == 'YES')
+            for problem in problems:
+                logger.error('Preflight: %s', problem)
+            if problems:
+                raise SystemExit(f'preflight failed with {len(problems)} problems')
+
+        # role templates of config_folder are compiled before any write, configs are rendered on push
+        node_configs = None
+        if config_folder and Evenger.node_config_variables(topology.sheet_rows):
+            try:
+                node_configs = Evenger.node_configs(topology.sheet_rows, config_folder)
+            except Exception as e:
+                logger.error(
+                    'Config templates of <%s> not compiled: %s', config_folder, e)
+                raise SystemExit(f'config templates not compiled: {e}')
+        build_rows = [
+            i for i in topology.sheet_rows if i[0] not in Evenger._data_sheets]
+
+        journal = None
+        if journal_file:
+            journal = BuildJournal(journal_file, resume=resume == 'YES')
+        try:
+            lab_exists = False
+            if reconcile == 'YES':
+                res = evenger_object._get(
+                    f'/api/labs/{evenger_object.lab_path}.unl')
+                lab_exists = isinstance(res, dict) and res.get('code') == 200
+            elif journal:
+                lab_exists = journal.done('add_lab')
+            if not lab_exists:
+                evenger_object.add_lab()
+                if journal:
+                    journal.record('add_lab')
+        except Exception as e:
+            logger.error(
+                'Check Excel sheet <_LAB_INFO>, evenger object not created: %s', e)
+            raise SystemExit
 
-        dir_module_funcs = [
-            name for name in dir(Evenger) if not name.startswith('_')
-        ]
+        try:
+            if reconcile == 'YES':
+                evenger_object.reconcile(
+                    build_rows, workers=int(workers))
+            else:
+                Evenger._excel_rows_run(
+                    evenger_object, build_rows, int(workers), journal)
+        finally:
+            if journal:
+                journal.close()
+        # upload startup configs before nodes start, telnet only for nodes left (all nodes if None)
+        telnet_nodes = None
+        if config_folder and startup_config == 'YES':
+            try:
+                results = evenger_object.upload_startup_configs(
+                    config_folder=config_folder, workers=int(workers), node_configs=node_configs)
+                telnet_nodes = [i['node'] for i in results if i['delivery'] == 'console']
+            except Exception as e:
+                logger.error(
+                    'Startup configs for <%s/*> failed: %s', config_folder, e)
+        return evenger_object, telnet_nodes, node_configs
 
-        sheets_in_func = [i for i in sheets if i in dir_module_funcs]
-
-        for sheet in sheets_in_func:
-            pd_sheet = pd.read_excel(
-                excel_filename, sheet_name=sheet, dtype=str,
-                skiprows=[0]
-            ).fillna('')
-            # remove first column
-            header = [i.strip() for i in list(pd_sheet.keys())][1:]
-            values = pd_sheet.iterrows()
-            for i, v in values:
-                # remove first column
-                v_strip = [i.strip() for i in v.to_list()[1:]]
-                try:
-                    zip_line = {i: j for i, j in zip(
-                        header, v_strip) if j != ''}
-                    evenger_func = getattr(evenger_object, sheet)
-                    evenger_func(**zip_line)
-                except Exception as e:
-                    logging.error(
-                        f'Excel sheet <{sheet}> line <{v_strip}> not completed: {e}')
+    @staticmethod
+    def _topology_start(evenger_object, auto_start='NO', config_folder='', node_boot_time=600, workers=1,
+                        report_file='', transcript_folder='', telnet_nodes=None, node_configs=None):
+        """ start nodes of created lab, config telnet_nodes (all nodes if None) and write report
+        (look <Evenger._topology_create>)
+        """
         # start nodes if auto_start is True
         try:
             if auto_start == 'YES':
                 evenger_object._get(
                     f'/api/labs/{evenger_object.lab_path}.unl/nodes/start')
-                logging.info(f'Nodes started for {evenger_object.lab_path}')
-                # wait boot time and run telnet configuration if config_folder
+                logger.info('Nodes started for %s', evenger_object.lab_path)
+                # run telnet configuration for each node when ready if config_folder
                 try:
-                    if config_folder:
-                        logging.info(
-                            f'Node boot time waiting for <{node_boot_time} seconds>')
-                        time.sleep(int(node_boot_time))
+                    if config_folder and telnet_nodes != []:
+                        logger.info(
+                            'Node ready waiting for max <%s seconds>', node_boot_time)
                         evenger_object.config_with_telnet(
-                            config_folder=config_folder)
-                        logging.info(
-                            f'Telnet configs for <{config_folder}/*> done!')
+                            config_folder=config_folder, workers=workers,
+                            ready_timeout=node_boot_time, log_debug=bool(transcript_folder),
+                            transcript_folder=transcript_folder, node_names=telnet_nodes,
+                            node_configs=node_configs)
+                        logger.info(
+                            'Telnet configs for <%s/*> done!', config_folder)
                 except Exception as e:
-                    logging.error(
-                        f'Telnet configs for <{config_folder}/*> failed: {e}')
+                    logger.error(
+                        'Telnet configs for <%s/*> failed: %s', config_folder, e)
         except Exception as e:
-            logging.error(
-                f'Nodes start failed: {e}')
+            logger.error(
+                'Nodes start failed: %s', e)
 
-        # return jump server vnc host/port
+        # latency summary per operation and timeline report
+        evenger_object.call_stats.log_summary()
+        if report_file:
+            try:
+                evenger_object.call_stats.write_report(report_file)
+            except Exception as e:
+                logger.error(
+                    'Timeline report <%s> not written: %s', report_file, e)
+
+    @staticmethod
+    def batch_labs(lab_paths, servers=''):
+        """ batch labs list, lab paths are assigned to servers in turn
+
+        ### Args:
+            - lab_paths : students/lab[01-30] or students/lab_1,students/lab_2 (look <Evenger.mesh_rows> name ranges)
+            - servers (optional) : http://172.18.18.18,http://172.18.18.19 (default: eveng_server_url of _LAB_INFO)
+
+        ### Returns:
+            - [{'lab_path': 'students/lab01', 'eveng_server_url': 'http://172.18.18.18'}, ...]
+
+        """
+        servers = Evenger._expand_names(servers) if servers else []
+        return [
+            {'lab_path': lab_path, **({'eveng_server_url': servers[index % len(servers)]} if servers else {})}
+            for index, lab_path in enumerate(Evenger._expand_names(lab_paths))]
+
+    @staticmethod
+    def batch_topology(excel_filename, labs, max_per_server=2, journal_folder='', report_file='', layout='',
+                       transcript_folder='', clone='NO', **build_args):
+        """create same topology for many labs/servers in parallel (excel file or csv folder, yaml/json file)
+
+        ### Args:
+            - excel_filename : evenger_topology.xlsx (_LAB_INFO is used for args not set in labs)
+            - labs : _LAB_INFO args per lab e.g. [{'lab_path': 'students/lab_1'},
+              {'lab_path': 'students/lab_2', 'eveng_server_url': 'http://172.18.18.19'}] (look <Evenger.batch_labs>)
+            - max_per_server (optional) : 2 (max labs built at same time on one eve-ng server)
+            - journal_folder (optional) : my_evenger_topology.xlsx.journals (one journal file per lab)
+            - report_file (optional) : batch_report.json (lab results)
+            - layout (optional) : grid, layered or force (look <Evenger.layout_rows>)
+            - transcript_folder (optional) : transcripts (telnet outputs in one sub folder per lab)
+            - clone (optional) : NO or YES (YES: only first lab is built, other labs are copies of its lab
+              file, <Evenger.clone_lab> on same server, <Evenger.import_lab> of one export on other servers,
+              then nodes of all labs are started/configured, reconcile/resume are only for first lab)
+            - build_args (optional) : auto_start, config_folder, node_boot_time, workers, reconcile, resume,
+              preflight, startup_config
+              (look <Evenger.excel_topology>)
+
+        ### Returns:
+            - lab results in labs order e.g. [{'eveng_server_url': 'http://172.18.18.18', 'lab_path': 'students/lab_1',
+              'status': 'done', 'duration': 42.1, 'api_calls': 812, 'api_errors': 0, 'error': ''}, ...]
+              (status: done, partial (some api calls or telnet sessions failed) or failed (all failed))
+
+        """
+        topology = Evenger.topology_load(excel_filename)
+        if layout:
+            topology.sheet_rows = Evenger.layout_rows(topology.sheet_rows, layout)
+        lab_infos = [{**topology.lab_info, **lab} for lab in labs]
+        semaphores = {
+            lab_info.get('eveng_server_url'): threading.Semaphore(max(int(max_per_server), 1))
+            for lab_info in lab_infos}
+        if journal_folder:
+            os.makedirs(journal_folder, exist_ok=True)
+        create_args = {
+            k: v for k, v in build_args.items()
+            if k in ('config_folder', 'workers', 'reconcile', 'resume', 'preflight', 'startup_config')}
+        start_args = {
+            k: v for k, v in build_args.items()
+            if k in ('auto_start', 'config_folder', 'node_boot_time', 'workers')}
+        # first lab (created lab, telnet nodes, node configs) and its export for clone
+        source = {}
+        source_created = threading.Event()
+        source_export_lock = threading.Lock()
+
+        def source_export():
+            with source_export_lock:
+                if 'export' not in source:
+                    source['export'] = source['created'][0].export_lab()
+                return source['export']
+
+        def copy_lab(lab_info):
+            if 'created' not in source:
+                raise ValueError(f'first lab <{lab_infos[0].get("lab_path")}> not created')
+            source_object, telnet_nodes, node_configs = source['created']
+            if lab_info.get('eveng_server_url') == source_object.eveng_server_url:
+                evenger_object = source_object.clone_lab(lab_info.get('lab_path'))
+            else:
+                evenger_object = Evenger(**lab_info).import_lab(source_export())
+            return evenger_object, telnet_nodes, node_configs
+
+        def build_lab(lab_info):
+            result = {
+                'eveng_server_url': lab_info.get('eveng_server_url'),
+                'lab_path': lab_info.get('lab_path'),
+                'status': 'failed',
+                'duration': 0.0,
+                'api_calls': 0,
+                'api_errors': 0,
+                'error': ''
+            }
+            lab_name = re.sub(
+                r'[^\w.-]+', '_', f'{result["eveng_server_url"]}_{result["lab_path"]}'.split('//')[-1])
+            lab_copy = clone == 'YES' and lab_info is not lab_infos[0]
+            if lab_copy:
+                # wait before server semaphore, first lab may need a slot of same server
+                source_created.wait()
+            with semaphores[result['eveng_server_url']]:
+                start_time = time.monotonic()
+                try:
+                    if lab_copy:
+                        created = copy_lab(lab_info)
+                    else:
+                        try:
+                            created = Evenger._topology_create(
+                                Topology(lab_info=lab_info, sheet_rows=topology.sheet_rows),
+                                journal_file=os.path.join(journal_folder, f'{lab_name}.journal') if journal_folder else '',
+                                **create_args)
+                            if clone == 'YES':
+                                source['created'] = created
+                        finally:
+                            source_created.set()
+                    evenger_object, telnet_nodes, node_configs = created
+                    Evenger._topology_start(
+                        evenger_object, telnet_nodes=telnet_nodes, node_configs=node_configs,
+                        transcript_folder=os.path.join(transcript_folder, lab_name) if transcript_folder else '',
+                        **start_args)
+                    histograms = evenger_object.call_stats.histograms()
+                    result['api_calls'] = sum(i['count'] for i in histograms.values())
+                    result['api_errors'] = sum(i['errors'] for i in histograms.values())
+                    if result['api_errors'] and result['api_errors'] == result['api_calls']:
+                        result['status'] = 'failed'
+                    elif result['api_errors']:
+                        result['status'] = 'partial'
+                    else:
+                        result['status'] = 'done'
+                except (Exception, SystemExit) as e:
+                    # SystemExit: _LAB_INFO of this lab not valid, other labs continue
+                    result['error'] = str(e) or 'evenger object not created'
+                result['duration'] = round(time.monotonic() - start_time, 3)
+            logger.info(
+                'Batch lab %s %s: %s in %s seconds', result['eveng_server_url'],
+                result['lab_path'], result['status'], result['duration'])
+            return result
+
+        # one thread per lab, labs wait for their server semaphore
+        with ThreadPoolExecutor(max_workers=max(len(lab_infos), 1)) as executor:
+            results = list(executor.map(build_lab, lab_infos))
+
+        logger.info(
+            'Batch summary: %s done, %s partial, %s failed',
+            sum(1 for i in results if i['status'] == 'done'),
+            sum(1 for i in results if i['status'] == 'partial'),
+            sum(1 for i in results if i['status'] == 'failed'))
+        if report_file:
+            try:
+                with open(report_file, 'w') as file:
+                    json.dump(results, file, indent=1)
+            except Exception as e:
+                logger.error('Batch report <%s> not written: %s', report_file, e)
+        return results
+
+    @staticmethod
+    def teardown_topology(excel_filename, actions=('stop',), workers=1):
+        """teardown lab of excel file (or csv folder, yaml/json file) _LAB_INFO
+
+        ### Args:
+            - excel_filename : evenger_create_lab_input.xlsx
+            - actions (optional) : ('stop',) any of stop, wipe, delete_orphans, delete_lab
+              (run in this order, delete_lab stops nodes before delete)
+            - workers (optional) : 1 (parallel api calls)
+
+        """
+        topology = Evenger.topology_load(excel_filename)
         try:
-            if jump_server_name:
-                server_id = evenger_object._node_name_id_dict_create()[
-                    jump_server_name]
-                server_vnc_url = evenger_object._get(
-                    f'/api/labs/{evenger_object.lab_path}.unl/nodes/{server_id}')['data']['url']
-                server_vnc_host, server_vnc_port = server_vnc_url.replace(
-                    'vnc://', '').split(':')
-                return server_vnc_host, server_vnc_port
+            evenger_object = Evenger(**topology.lab_info)
         except Exception as e:
-            logging.error(
-                f'Jump_server {jump_server_name} vnc host/port failed: {e}')
+            logger.error(
+                'Check Excel sheet <_LAB_INFO>, evenger object not created: %s', e)
+            raise SystemExit
+
+        for action in Evenger._teardown_actions:
+            if action not in actions:
+                continue
+            try:
+                if action == 'stop':
+                    evenger_object.stop_nodes(workers=int(workers))
+                elif action == 'wipe':
+                    evenger_object.wipe_nodes(workers=int(workers))
+                elif action == 'delete_orphans':
+                    evenger_object.delete_orphan_networks(workers=int(workers))
+                else:
+                    evenger_object.delete_lab(
+                        stop='stop' not in actions, workers=int(workers))
+            except Exception as e:
+                logger.error(
+                    'Teardown <%s> for %s failed: %s', action, evenger_object.lab_path, e)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """ one json object per log line with time, level, logger, message and extra fields """
+    _RECORD_KEYS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        log_line = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        log_line.update(
+            {k: v for k, v in vars(record).items() if k not in self._RECORD_KEYS})
+        if record.exc_info:
+            log_line['exception'] = self.formatException(record.exc_info)
+        return json.dumps(log_line, default=str)
+
+
+def setup_logging(level='INFO', log_format='text', log_file=''):
+    """ configure logging for evenger CLI or scripts
+
+    ### Args:
+        - level (optional) : INFO (DEBUG, INFO, WARNING or ERROR, DEBUG also logs api response bodies)
+        - log_format (optional) : text or json (one json object per line)
+        - log_file (optional) : evenger.log (default: stderr)
+
+    """
+    handler = logging.FileHandler(log_file) if log_file else logging.StreamHandler()
+    if log_format == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s.%(msecs)03d %(levelname)s: %(message)s', '%Y-%m-%d %H:%M:%S'))
+    logging.basicConfig(handlers=[handler], level=level, force=True)
 
 
 def run_cli():
@@ -622,7 +3379,7 @@ def run_cli():
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '--excel_file',
-        help='excel file path [e.g. my_evenger_topology.xlsx] (default: --excel_file=evenger_topology.xlsx)')
+        help='excel file, csv folder or yaml/json file path [e.g. my_evenger_topology.xlsx] (default: --excel_file=evenger_topology.xlsx)')
     parser.add_argument(
         '--config_folder',
         help='config folder path [e.g. my_configs_folder] (OPTIONAL default: --config_folder=configs)')
@@ -632,22 +3389,139 @@ def run_cli():
     parser.add_argument(
         '--boot_time',
         type=int,
-        help='node boot time in seconds [e.g. 150] (default: --boot_time=180)')
+        help='max node boot time in seconds, nodes are configured when ready [e.g. 300] (default: --boot_time=600)')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='parallel api calls for nodes/networks and connections and parallel telnet sessions [e.g. 8] (default: --workers=1)')
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='skip build steps completed in journal file <excel_file>.journal of previous run')
+    parser.add_argument(
+        '--reconcile',
+        default='NO',
+        help='apply only needed changes to existing lab [YES or NO] (default: --reconcile=NO)')
+    parser.add_argument(
+        '--preflight',
+        default='YES',
+        help='check node images/names, link ports and bridges before any write [YES or NO] (default: --preflight=YES)')
+    parser.add_argument(
+        '--startup_config',
+        default='NO',
+        help='upload config files as startup config before nodes start, telnet only for other nodes [YES or NO] (default: --startup_config=NO)')
+    parser.add_argument(
+        '--report_file',
+        default='',
+        help='api call/telnet timeline report, json with latency histograms or csv [e.g. build_report.json] (OPTIONAL)')
+    parser.add_argument(
+        '--transcript_folder',
+        default='',
+        help='telnet outputs folder, one rotating file per node [e.g. transcripts] (OPTIONAL)')
+    parser.add_argument(
+        '--layout',
+        default='',
+        choices=('', 'grid', 'layered', 'force'),
+        metavar='LAYOUT',
+        help='set left/top of nodes/bridges without left/top from links [grid, layered or force] (OPTIONAL)')
+    parser.add_argument(
+        '--log_level',
+        default='INFO',
+        choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+        help='log level, DEBUG also logs api response bodies (default: --log_level=INFO)')
+    parser.add_argument(
+        '--log_format',
+        default='text',
+        choices=('text', 'json'),
+        help='log format, json is one json object per line (default: --log_format=text)')
+    parser.add_argument(
+        '--log_file',
+        default='',
+        help='log file path [e.g. evenger.log] (OPTIONAL default: stderr)')
+
+    subparsers = parser.add_subparsers(dest='command')
+    teardown_parser = subparsers.add_parser(
+        'teardown',
+        help='stop/wipe nodes, delete orphan link networks or delete lab of excel file _LAB_INFO')
+    teardown_parser.add_argument(
+        '--excel_file',
+        default=argparse.SUPPRESS,
+        help='excel file, csv folder or yaml/json file path [e.g. my_evenger_topology.xlsx] (default: --excel_file=evenger_topology.xlsx)')
+    teardown_parser.add_argument(
+        '--actions',
+        nargs='+',
+        choices=Evenger._teardown_actions,
+        default=['stop'],
+        help='teardown actions, run in this order: stop wipe delete_orphans delete_lab (default: --actions stop)')
+    teardown_parser.add_argument(
+        '--workers',
+        type=int,
+        default=argparse.SUPPRESS,
+        help='parallel api calls [e.g. 8] (default: --workers=1)')
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='create excel file topology for many labs/servers in parallel (other options as main command)')
+    batch_parser.add_argument(
+        '--excel_file',
+        default=argparse.SUPPRESS,
+        help='excel file, csv folder or yaml/json file path [e.g. my_evenger_topology.xlsx] (default: --excel_file=evenger_topology.xlsx)')
+    batch_parser.add_argument(
+        '--lab_paths',
+        required=True,
+        help='lab paths, comma separated or with range [e.g. students/lab[01-30]]')
+    batch_parser.add_argument(
+        '--servers',
+        default='',
+        help='eve-ng servers, labs are assigned in turn [e.g. http://172.18.18.18,http://172.18.18.19] (default: _LAB_INFO server)')
+    batch_parser.add_argument(
+        '--max_per_server',
+        type=int,
+        default=2,
+        help='max labs created at same time on one server [e.g. 4] (default: --max_per_server=2)')
+    batch_parser.add_argument(
+        '--workers',
+        type=int,
+        default=argparse.SUPPRESS,
+        help='parallel api calls per lab [e.g. 8] (default: --workers=1)')
+    batch_parser.add_argument(
+        '--clone',
+        action='store_true',
+        help='build only first lab, other labs are copies of its lab file (clone on same server, import of one export on other servers)')
 
     args = parser.parse_args()
 
+    # LOG OPTIONS
+    setup_logging(args.log_level, args.log_format, args.log_file)
+
     if args.excel_file:
         excel_file = args.excel_file
     else:
         excel_file = 'evenger_topology.xlsx'
     if not os.path.exists(excel_file):
-        logging.error(f'Excel file <{excel_file}> not found!')
+        logger.error('Excel file <%s> not found!', excel_file)
         raise SystemExit
 
+    workers = args.workers
+    if workers < 1:
+        logger.error('Workers <%s> must be positive integer!', workers)
+        raise SystemExit
+
+    if args.command == 'teardown':
+        logger.info(
+            'CLI args: teardown excel_file=%r, actions=%s, workers=%r',
+            excel_file, args.actions, workers)
+        Evenger.teardown_topology(
+            excel_filename=excel_file,
+            actions=args.actions,
+            workers=workers
+        )
+        return
+
     if args.config_folder:
         config_folder = args.config_folder
         if not os.path.exists(config_folder):
-            logging.error(f'Config folder <{config_folder}> not found!')
+            logger.error('Config folder <%s> not found!', config_folder)
             raise SystemExit
     else:
         config_folder = 'configs'
@@ -659,25 +3533,81 @@ def run_cli():
     else:
         auto_start = 'YES'
     if auto_start != 'YES' and auto_start != 'NO':
-        logging.error(f'Auto start <{auto_start}> must be YES or NO!')
+        logger.error('Auto start <%s> must be YES or NO!', auto_start)
         raise SystemExit
 
     if args.boot_time:
         boot_time = args.boot_time
     else:
-        boot_time = 180
+        boot_time = 600
     if not isinstance(boot_time, int):
-        logging.error(f'Boot time <{boot_time}> must be integer!')
+        logger.error('Boot time <%s> must be integer!', boot_time)
         raise SystemExit
 
-    logging.info(
-        f'CLI args: {excel_file=}, {config_folder=}, {auto_start=}, {boot_time=}')
+    reconcile = args.reconcile
+    if reconcile != 'YES' and reconcile != 'NO':
+        logger.error('Reconcile <%s> must be YES or NO!', reconcile)
+        raise SystemExit
+
+    preflight = args.preflight
+    if preflight != 'YES' and preflight != 'NO':
+        logger.error('Preflight <%s> must be YES or NO!', preflight)
+        raise SystemExit
+
+    startup_config = args.startup_config
+    if startup_config != 'YES' and startup_config != 'NO':
+        logger.error('Startup config <%s> must be YES or NO!', startup_config)
+        raise SystemExit
+
+    if args.command == 'batch':
+        if args.max_per_server < 1:
+            logger.error('Max per server <%s> must be positive integer!', args.max_per_server)
+            raise SystemExit
+        labs = Evenger.batch_labs(args.lab_paths, args.servers)
+        logger.info(
+            'CLI args: batch excel_file=%r, labs=%s, servers=%r, max_per_server=%s, workers=%r, clone=%s',
+            excel_file, len(labs), args.servers, args.max_per_server, workers, args.clone)
+        Evenger.batch_topology(
+            excel_filename=excel_file,
+            labs=labs,
+            max_per_server=args.max_per_server,
+            journal_folder=f'{excel_file}.journals',
+            report_file=args.report_file,
+            layout=args.layout,
+            transcript_folder=args.transcript_folder,
+            clone='YES' if args.clone else 'NO',
+            auto_start=auto_start,
+            config_folder=config_folder,
+            node_boot_time=boot_time,
+            workers=workers,
+            reconcile=reconcile,
+            resume='YES' if args.resume else 'NO',
+            preflight=preflight,
+            startup_config=startup_config
+        )
+        return
+
+    logger.info(
+        'CLI args: excel_file=%r, config_folder=%r, auto_start=%r, boot_time=%r, workers=%r, '
+        'reconcile=%r, resume=%s, report_file=%s, transcript_folder=%s, layout=%s, preflight=%s, '
+        'startup_config=%s',
+        excel_file, config_folder, auto_start, boot_time, workers, reconcile, args.resume,
+        args.report_file, args.transcript_folder, args.layout, preflight, startup_config)
 
     Evenger.excel_topology(
         excel_filename=excel_file,
         auto_start=auto_start,
         config_folder=config_folder,
-        node_boot_time=boot_time
+        node_boot_time=boot_time,
+        workers=workers,
+        reconcile=reconcile,
+        journal_file=f'{excel_file}.journal',
+        resume='YES' if args.resume else 'NO',
+        report_file=args.report_file,
+        transcript_folder=args.transcript_folder,
+        layout=args.layout,
+        preflight=preflight,
+        startup_config=startup_config
     )
 
 
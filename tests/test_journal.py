@@ -0,0 +1,74 @@
+'''
+Build journal tests against local eve-ng simulator (benchmarks/eveng_simulator.py)
+
+Run: python -m pytest tests
+'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from evenger import Evenger  # noqa: E402
+from evenger.evenger import BuildJournal  # noqa: E402
+from eveng_simulator import EvengSimulator  # noqa: E402
+
+LAB_PATH = 'tests/journal'
+
+
+@pytest.fixture
+def simulator():
+    with EvengSimulator() as simulator:
+        yield simulator
+
+
+def _fail_interface_puts(simulator, monkeypatch):
+    ''' answer node interface updates with 500 until monkeypatch is undone '''
+    route = simulator._route
+
+    def failing_route(method, path, body):
+        if method == 'PUT' and path.endswith('/interfaces'):
+            return 500, None, 'Injected error', []
+        return route(method, path, body)
+    monkeypatch.setattr(simulator, '_route', failing_route)
+
+
+@pytest.mark.parametrize('sheet, header, v_strip', [
+    ('connect_node_to_node', ['first_node', 'first_port', 'second_node', 'second_port'],
+     ['a', 'e0', 'b', 'e0']),
+    ('connect_node_to_bridge', ['node_name', 'node_port', 'bridge_name'], ['a', 'e1', 'Management']),
+])
+def test_failed_connection_is_not_journaled(simulator, monkeypatch, tmp_path, sheet, header, v_strip):
+    evenger_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve', lab_path=LAB_PATH, retries=0)
+    evenger_object.add_lab()
+    evenger_object.add_node_linux(image='linux-centos7', name='a')
+    evenger_object.add_node_linux(image='linux-centos7', name='b')
+    evenger_object.add_network(name='Management', type='bridge')
+    journal_file = str(tmp_path / 'topology.journal')
+    step = BuildJournal.row_step(sheet, v_strip)
+
+    _fail_interface_puts(simulator, monkeypatch)
+    journal = BuildJournal(journal_file)
+    Evenger._excel_row_run(evenger_object, sheet, header, v_strip, journal)
+    journal.close()
+    assert not BuildJournal(journal_file, resume=True).done(step)
+    assert simulator.links(LAB_PATH) == {}
+
+    # resume runs failed row again
+    monkeypatch.undo()
+    journal = BuildJournal(journal_file, resume=True)
+    Evenger._excel_row_run(evenger_object, sheet, header, v_strip, journal)
+    journal.close()
+    assert BuildJournal(journal_file, resume=True).done(step)
+    assert ('a', v_strip[1]) in [j for i in simulator.links(LAB_PATH).values() for j in i]
+
+
+def test_failed_add_lab_raises(simulator):
+    evenger_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve', lab_path=LAB_PATH, retries=0)
+    evenger_object.add_lab()
+    with pytest.raises(ValueError, match='not added'):
+        evenger_object.add_lab()
@@ -0,0 +1,29 @@
+'''
+Force layout tests (numpy and pure python paths)
+
+Run: python -m pytest tests
+'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from evenger import Evenger  # noqa: E402
+
+
+@pytest.mark.parametrize('fixed_names', [[], ['r0', 'r30']])
+def test_force_layout_numpy_same_as_python(monkeypatch, fixed_names):
+    pytest.importorskip('numpy')
+    names = [f'r{i}' for i in range(60)]
+    edges = [(names[i], names[(i + 1) % len(names)]) for i in range(len(names))]
+    positions = {name: None for name in names}
+    positions.update((name, (index * 900.0, 0.0)) for index, name in enumerate(fixed_names))
+
+    numpy_result = Evenger._layout_force(names, edges, positions, 150, 50)
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    python_result = Evenger._layout_force(names, edges, positions, 150, 50)
+
+    assert numpy_result == python_result
+    assert len(python_result) == len(names) - len(fixed_names)
@@ -0,0 +1,58 @@
+'''
+Lookup cache tests against local eve-ng simulator (benchmarks/eveng_simulator.py)
+
+Run: python -m pytest tests
+'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from evenger import Evenger  # noqa: E402
+from evenger.evenger import LookupCache  # noqa: E402
+from eveng_simulator import EvengSimulator  # noqa: E402
+
+LAB_PATH = 'tests/lookup_cache'
+
+
+@pytest.fixture
+def simulator():
+    with EvengSimulator() as simulator:
+        yield simulator
+
+
+def test_invalidated_name_is_fetched_by_get_all():
+    fetches = []
+
+    def fetch_all():
+        fetches.append(1)
+        return {'n1': '1', 'n2': '2'}
+    cache = LookupCache(fetch_all=fetch_all)
+    assert cache.get_all() == {'n1': '1', 'n2': '2'}
+
+    cache.invalidate('n1')
+
+    assert cache.get_all() == {'n1': '1', 'n2': '2'}
+    assert len(fetches) == 2
+    # value mismatch keeps entry and loaded entries
+    cache.invalidate('n1', '2')
+    assert cache.get_all() == {'n1': '1', 'n2': '2'}
+    assert len(fetches) == 2
+
+
+def test_invalidated_node_is_not_skipped(simulator):
+    evenger_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve', lab_path=LAB_PATH)
+    evenger_object.add_lab()
+    evenger_object.add_node_linux(image='linux-centos7', name='n1')
+    evenger_object.add_node_linux(image='linux-centos7', name='n2')
+    assert set(evenger_object._nodename_interface_id_dict_create()) == {'n1', 'n2'}
+
+    evenger_object.invalidate_cache('node', 'n1')
+
+    assert set(evenger_object._node_name_id_dict_create()) == {'n1', 'n2'}
+    assert set(evenger_object._nodename_interface_id_dict_create()) == {'n1', 'n2'}
+    assert set(evenger_object.stop_nodes()) == {'n1', 'n2'}
@@ -0,0 +1,73 @@
+'''
+Reconcile regression tests against local eve-ng simulator (benchmarks/eveng_simulator.py)
+
+Run: python -m pytest tests
+'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from evenger import Evenger  # noqa: E402
+from eveng_simulator import EvengSimulator  # noqa: E402
+
+LAB_PATH = 'tests/reconcile'
+
+
+@pytest.fixture
+def simulator():
+    with EvengSimulator() as simulator:
+        yield simulator
+
+
+def _evenger(simulator):
+    evenger_object = Evenger(
+        eveng_server_url=simulator.url, username='admin', password='eve', lab_path=LAB_PATH)
+    evenger_object.add_lab()
+    return evenger_object
+
+
+def _rows(nodes, links):
+    ''' topology rows of linux nodes and node to node links ((node, port), (node, port)) '''
+    return [
+        *(('add_node_linux', ['image', 'name'], ['linux-centos7', i]) for i in nodes),
+        *(('connect_node_to_node', ['first_node', 'first_port', 'second_node', 'second_port'],
+           [first[0], first[1], second[0], second[1]]) for first, second in links)]
+
+
+def _lab_links(simulator):
+    ''' set of links (sorted ports) of lab '''
+    return {tuple(sorted(i)) for i in simulator.links(LAB_PATH).values()}
+
+
+def test_reconcile_deletes_linked_node(simulator):
+    evenger_object = _evenger(simulator)
+    links = [(('a', 'e0'), ('b', 'e0')), (('b', 'e1'), ('c', 'e0'))]
+    Evenger._excel_rows_run(evenger_object, _rows('abc', links))
+
+    plan = evenger_object.reconcile(_rows('ab', links[:1]))
+
+    assert plan['detach_ports'] == [('b', 'e1')]
+    assert [i['name'] for i in simulator.lab(LAB_PATH)['nodes'].values()] == ['a', 'b']
+    assert _lab_links(simulator) == {(('a', 'e0'), ('b', 'e0'))}
+    assert len(simulator.lab(LAB_PATH)['networks']) == 1
+
+
+def test_reconcile_keeps_links_of_duplicate_nodes(simulator):
+    evenger_object = _evenger(simulator)
+    links = [(('a', 'e0'), ('b', 'e0'))]
+    Evenger._excel_rows_run(evenger_object, _rows('ab', links))
+    # duplicate nodes of partial build run
+    Evenger._excel_rows_run(evenger_object, _rows('ab', []))
+    network_ids = set(simulator.lab(LAB_PATH)['networks'])
+
+    plan = evenger_object.reconcile(_rows('ab', links))
+
+    assert len(plan['delete_nodes']) == 2
+    assert plan['delete_networks'] == [] and plan['create_links'] == []
+    assert [i['name'] for i in simulator.lab(LAB_PATH)['nodes'].values()] == ['a', 'b']
+    assert set(simulator.lab(LAB_PATH)['networks']) == network_ids
+    assert _lab_links(simulator) == {(('a', 'e0'), ('b', 'e0'))}
@@ -0,0 +1,137 @@
+'''
+Telnet console tests against local telnet server (benchmarks/eveng_simulator.py)
+
+Run: python -m pytest tests
+'''
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from evenger import Evenger  # noqa: E402
+from evenger.evenger import TelnetConsole  # noqa: E402
+from eveng_simulator import FakeTelnetConsole  # noqa: E402
+
+IAC, DO, WILL, WONT, DONT, SB, SE = 255, 253, 251, 252, 254, 250, 240
+ECHO, SGA = 1, 3
+
+LOGIN = '''
+    _EXPECT: ogin
+    admin
+    _EXPECT: assword
+    admin
+    _EXPECT: #
+'''
+
+
+@pytest.fixture
+def console_server():
+    console_server = FakeTelnetConsole().start()
+    yield console_server
+    console_server.stop()
+
+
+class _Writer:
+    ''' stream writer stand-in, keeps written bytes '''
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+async def _chunks_read(chunks, expected=None, timeout=1):
+    ''' feed chunks one by one to console, return (read_until result, pending data, written bytes) '''
+    reader = asyncio.StreamReader()
+    writer = _Writer()
+    console = TelnetConsole(reader, writer)
+    read_task = asyncio.create_task(console.read_until(expected, timeout, consume=False)) if expected else None
+    for chunk in chunks:
+        reader.feed_data(chunk)
+        await asyncio.sleep(0.01)
+    found = await read_task if read_task else None
+    pending = bytes(console._pending)
+    await console.close()
+    return found, pending, bytes(writer.data)
+
+
+def _commands_run(console_server, commands_text):
+    start = time.monotonic()
+    transcript = asyncio.run(Evenger._send_telnet_commands_async(
+        commands_text, console_server.host, console_server.port))
+    return transcript, time.monotonic() - start
+
+
+def _lines_received(console_server, lines, timeout=1):
+    ''' wait server to receive last line sent before console close '''
+    deadline = time.monotonic() + timeout
+    while console_server.lines < lines and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return console_server.lines == lines
+
+
+def test_login_session_without_telnet_commands(console_server):
+    transcript, _ = _commands_run(console_server, LOGIN + 'show version')
+
+    assert transcript is not None
+    assert 'node#' in transcript and '\ufffd' not in transcript
+    assert _lines_received(console_server, 1)
+
+
+def test_iac_filter():
+    _, pending, written = asyncio.run(_chunks_read([
+        bytes([IAC, DO, ECHO]) + b'log' + bytes([IAC, IAC]) + b'in'
+        + bytes([IAC, SB, 24, 1, IAC, SE, IAC, WILL, SGA]) + b'\x00: ']))
+
+    assert pending == b'log\xffin: '
+    assert written == bytes([IAC, WONT, ECHO, IAC, DONT, SGA])
+
+
+def test_iac_split_across_chunks():
+    _, pending, written = asyncio.run(_chunks_read([
+        b'log' + bytes([IAC]), bytes([DO]), bytes([ECHO]) + b'in' + bytes([IAC, SB, 24]),
+        bytes([1, IAC]), bytes([SE]) + b': ' + bytes([IAC]), bytes([IAC])]))
+
+    assert pending == b'login: \xff'
+    assert written == bytes([IAC, WONT, ECHO])
+
+
+def test_expect_split_across_chunks():
+    start = time.monotonic()
+    found, _, _ = asyncio.run(_chunks_read([b'\r\nlo', b'gi', b'n: '], b'login: ', timeout=5))
+
+    assert found
+    assert time.monotonic() - start < 1
+
+
+def test_timeout_expiry(console_server):
+    transcript, elapsed = _commands_run(
+        console_server, LOGIN + '_TIMEOUT: 1\n_EXPECT: not received\nshow version')
+
+    assert transcript is not None
+    assert 1 <= elapsed < 3
+    # command is sent after expect timeout
+    assert _lines_received(console_server, 1)
+
+
+def test_sleep(console_server):
+    transcript, elapsed = _commands_run(console_server, LOGIN + '_SLEEP: 1\nshow version')
+
+    assert transcript is not None
+    assert 1 <= elapsed < 3
+    assert _lines_received(console_server, 1)